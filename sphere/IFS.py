@@ -303,7 +303,7 @@ def wavelength_optimisation(wave_ref, wave_scale, wave_lasers, peak_position_las
     '''
 
     nwave = wave_scale.size
-    idx  = np.arange(nwave, dtype=np.float)
+    idx  = np.arange(nwave, dtype=float)
     wave = np.full(nwave, wave_ref) * wave_scale
     intrp_func = interp.interp1d(idx, wave, kind='linear')
     wave_peaks = intrp_func(peak_position_lasers)
@@ -945,19 +945,18 @@ class Reduction(object):
             if key.find('HIERARCH ESO ') != -1:
                 keywords_short[idx] = key[13:]
 
-        # files table
-        self._logger.debug('> create files_info data frame')
-        files_info = pd.DataFrame(index=pd.Index(files, name='FILE'), columns=keywords_short, dtype='float')
-
+        # read FITS keywords; accumulate rows and build the data frame
+        # in one go to avoid per-cell pandas assignments
         self._logger.debug('> read FITS keywords')
+        rows = []
         for f in files:
-            hdu = fits.open(path.raw / '{}.fits'.format(f))
-            hdr = hdu[0].header
-
-            for k, sk in zip(keywords, keywords_short):
-                files_info.loc[f, sk] = hdr.get(k)
+            hdr = fits.getheader(path.raw / '{}.fits'.format(f), ext=0)
+            rows.append({sk: hdr.get(k) for k, sk in zip(keywords, keywords_short)})
 
-            hdu.close()
+        # files table
+        self._logger.debug('> create files_info data frame')
+        files_info = pd.DataFrame.from_records(rows, index=pd.Index(files, name='FILE'), columns=keywords_short)
+        files_info = files_info.infer_objects()
 
         # drop files that are not handled, based on DPR keywords
         self._logger.debug('> drop unsupported file types')
@@ -2633,7 +2632,7 @@ class Reduction(object):
 
         # fit
         self._logger.debug('> fit individual peaks')
-        wave_idx = np.arange(nwave, dtype=np.float)
+        wave_idx = np.arange(nwave, dtype=float)
         peak_position_lasers = []
         if ifs_mode == 'OBS_YJ':
             # peak 1
@@ -3015,7 +3014,7 @@ class Reduction(object):
                 return                    
 
             if manual_center.shape == (2,):
-                manual_center = np.full((nwave, 2), manual_center, dtype=np.float)
+                manual_center = np.full((nwave, 2), manual_center, dtype=float)
 
             self._logger.warning('Images will be centered using the user-provided center ({},{})'.format(*manual_center[0]))
 
@@ -3057,11 +3056,11 @@ class Reduction(object):
                     centers = fits.getdata(cfile)
                 else:
                     self._logger.warning('sph_ifs_star_center() has not been executed. Images will be centered using default center ({},{})'.format(*self._default_center))
-                    centers = np.full((nwave, 2), self._default_center, dtype=np.float)
+                    centers = np.full((nwave, 2), self._default_center, dtype=float)
 
                 # make sure we have only integers if user wants coarse centering
                 if coarse_centering:
-                    centers = centers.astype(np.int)
+                    centers = centers.astype(int)
                 
                 # mask values outside of IFS FoV
                 cube[cube == 0] = np.nan
@@ -3083,7 +3082,7 @@ class Reduction(object):
                     cx, cy = centers[wave_idx, :]
 
                     self._logger.debug('> shift and normalize')
-                    img  = img[:-1, :-1].astype(np.float)
+                    img  = img[:-1, :-1].astype(np.float32)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
@@ -3159,7 +3158,7 @@ class Reduction(object):
                 
                 # make sure we have only integers if user wants coarse centering
                 if coarse_centering:
-                    centers = centers.astype(np.int)
+                    centers = centers.astype(int)
                 
                 # mask values outside of IFS FoV
                 cube[cube == 0] = np.nan
@@ -3181,7 +3180,7 @@ class Reduction(object):
                     cx, cy = centers[wave_idx, :]
 
                     self._logger.debug('> shift and normalize')
-                    img  = img[:-1, :-1].astype(np.float)
+                    img  = img[:-1, :-1].astype(np.float32)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
@@ -3237,7 +3236,7 @@ class Reduction(object):
                 starcen_files = frames_info[frames_info['DPR TYPE'] == 'OBJECT,CENTER']
                 if len(starcen_files) == 0:
                     self._logger.warning('No OBJECT,CENTER file in the dataset. Images will be centered using default center ({},{})'.format(*self._default_center))
-                    centers = np.full((nwave, 2), self._default_center, dtype=np.float)
+                    centers = np.full((nwave, 2), self._default_center, dtype=float)
                 else:
                     fname = '{0}_DIT{1:03d}_preproc_centers.fits'.format(starcen_files.index.values[0][0], starcen_files.index.values[0][1])
                     fpath = path.preproc / fname
@@ -3246,11 +3245,11 @@ class Reduction(object):
                         centers = fits.getdata(fpath)
                     else:
                         self._logger.warning('sph_ifs_star_center() has not been executed. Images will be centered using default center ({},{})'.format(*self._default_center))
-                        centers = np.full((nwave, 2), self._default_center, dtype=np.float)
+                        centers = np.full((nwave, 2), self._default_center, dtype=float)
 
             # make sure we have only integers if user wants coarse centering
             if coarse_centering:
-                centers = centers.astype(np.int)
+                centers = centers.astype(int)
 
             # final center
             if cpix:
@@ -3295,7 +3294,7 @@ class Reduction(object):
                     cx, cy = centers[wave_idx, :]
 
                     self._logger.debug('> shift and normalize')
-                    img  = img[:-1, :-1].astype(np.float)
+                    img  = img[:-1, :-1].astype(np.float32)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
@@ -568,19 +568,18 @@ class ImagingReduction(object):
             if key.find('HIERARCH ESO ') != -1:
                 keywords_short[idx] = key[13:]
 
-        # files table
-        self._logger.debug('> create files_info data frame')
-        files_info = pd.DataFrame(index=pd.Index(files, name='FILE'), columns=keywords_short, dtype='float')
-
+        # read FITS keywords; accumulate rows and build the data frame
+        # in one go to avoid per-cell pandas assignments
         self._logger.debug('> read FITS keywords')
+        rows = []
         for f in files:
-            hdu = fits.open(path.raw / '{}.fits'.format(f))
-            hdr = hdu[0].header
+            hdr = fits.getheader(path.raw / '{}.fits'.format(f), ext=0)
+            rows.append({sk: hdr.get(k) for k, sk in zip(keywords, keywords_short)})
 
-            for k, sk in zip(keywords, keywords_short):
-                files_info.loc[f, sk] = hdr.get(k)
-
-            hdu.close()
+        # files table
+        self._logger.debug('> create files_info data frame')
+        files_info = pd.DataFrame.from_records(rows, index=pd.Index(files, name='FILE'), columns=keywords_short)
+        files_info = files_info.infer_objects()
 
         # drop files that are not handled, based on DPR keywords
         self._logger.debug('> drop unsupported file types')
@@ -1619,7 +1618,7 @@ class ImagingReduction(object):
                 return
 
             if manual_center.shape == (2,):
-                manual_center = np.full((nwave, 2), manual_center, dtype=np.float)
+                manual_center = np.full((nwave, 2), manual_center, dtype=float)
 
             self._logger.warning('Images will be centered using the user-provided center ({},{})'.format(*manual_center[0]))
 
@@ -1663,7 +1662,7 @@ class ImagingReduction(object):
 
                 # make sure we have only integers if user wants coarse centering
                 if coarse_centering:
-                    centers = centers.astype(np.int)
+                    centers = centers.astype(int)
 
                 # neutral density
                 self._logger.debug('> read neutral density information')
@@ -1682,7 +1681,7 @@ class ImagingReduction(object):
                     cx, cy = centers[wave_idx, :]
 
                     self._logger.debug('> shift and normalize')
-                    img  = img.astype(np.float)
+                    img  = img.astype(np.float32, copy=False)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
@@ -1757,7 +1756,7 @@ class ImagingReduction(object):
 
                 # make sure we have only integers if user wants coarse centering
                 if coarse_centering:
-                    centers = centers.astype(np.int)
+                    centers = centers.astype(int)
 
                 # neutral density
                 self._logger.debug('> read neutral density information')
@@ -1776,7 +1775,7 @@ class ImagingReduction(object):
                     cx, cy = centers[wave_idx, :]
 
                     self._logger.debug('> shift and normalize')
-                    img  = img.astype(np.float)
+                    img  = img.astype(np.float32, copy=False)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
@@ -1853,9 +1852,9 @@ class ImagingReduction(object):
 
             # make sure we have only integers if user wants coarse centering
             if coarse_centering:
-                centers = centers.astype(np.int)
-                dms_dx_ref = np.int(dms_dx_ref)
-                dms_dy_ref = np.int(dms_dy_ref)
+                centers = centers.astype(int)
+                dms_dx_ref = int(dms_dx_ref)
+                dms_dy_ref = int(dms_dy_ref)
 
             # final center
             if cpix:
@@ -1899,8 +1898,8 @@ class ImagingReduction(object):
 
                 # make sure we have only integers if user wants coarse centering
                 if coarse_centering:
-                    dms_dx = np.int(dms_dx)
-                    dms_dy = np.int(dms_dy)
+                    dms_dx = int(dms_dx)
+                    dms_dy = int(dms_dy)
 
                 # center frames
                 for wave_idx, img in enumerate(cube):
@@ -1912,7 +1911,7 @@ class ImagingReduction(object):
                     cy = cy + dms_dy_ref + dms_dy
 
                     self._logger.debug('> shift and normalize')
-                    img  = img.astype(np.float)
+                    img  = img.astype(np.float32, copy=False)
                     nimg = imutils.shift(img, (cc-cx, cc-cy), method=shift_method)
                     nimg = nimg / DIT / attenuation[wave_idx]
 
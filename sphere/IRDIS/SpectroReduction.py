@@ -1,3 +1,4 @@
+import ast
 import pandas as pd
 import subprocess
 import logging
@@ -12,7 +13,11 @@ import matplotlib.patches as patches
 import matplotlib.colors as colors
 import configparser
 import collections
+import functools
+import os
+import warnings
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from astropy.io import fits
 from astropy.modeling import models, fitting
@@ -28,6 +33,90 @@ import sphere.toolbox as toolbox
 _log = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _read_keywords():
+    '''
+    Read the list of IRDIS/IFS keywords and their short form
+
+    The result never changes during the lifetime of a process, so it is
+    parsed only once and cached.
+
+    Returns
+    -------
+    keywords, keywords_short : tuple of str
+        Full and shortened FITS keywords
+    '''
+
+    text = (Path(sphere.__file__).parent / 'instruments' / 'keywords_irdifs.dat').read_text()
+    keywords = tuple(line for line in map(str.strip, text.splitlines())
+                     if line and not line.startswith('#'))
+
+    # short keywords
+    keywords_short = tuple(k[13:] if k.startswith('HIERARCH ESO ') else k for k in keywords)
+
+    return keywords, keywords_short
+
+
+@functools.lru_cache(maxsize=32)
+def _read_csv_cached(fname, mtime, index_col, time_columns):
+    '''
+    Read and parse one of the reduction CSV files, with caching
+
+    The modification time is part of the cache key, so the cache is
+    automatically invalidated when the file is rewritten by one of the
+    recipes. Callers must copy the returned data frame before any
+    modification.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the CSV file
+
+    mtime : float
+        Modification time of the file
+
+    index_col : int or tuple
+        Column(s) holding the index
+
+    time_columns : tuple of str
+        Names of the timestamp columns to convert
+
+    Returns
+    -------
+    df : dataframe
+        Parsed data frame
+    '''
+
+    if isinstance(index_col, tuple):
+        index_col = list(index_col)
+    df = pd.read_csv(fname, index_col=index_col)
+
+    # convert times
+    _parse_times(df, time_columns)
+
+    return df
+
+
+def _parse_times(df, columns):
+    '''
+    Convert timestamp columns of a data frame in place
+
+    The explicit ISO8601 format avoids pandas' per-value format
+    inference, which dominates the cost of reloading the CSV files.
+
+    Parameters
+    ----------
+    df : dataframe
+        Data frame with the timestamp columns
+
+    columns : tuple of str
+        Names of the columns to convert
+    '''
+
+    for col in columns:
+        df[col] = pd.to_datetime(df[col], utc=False, format='ISO8601', cache=True)
+
+
 def get_wavelength_calibration(filter_comb, wave_calib, centers, wave_min, wave_max):
     '''
     Return the linear wavelength calibration for each IRDIS field
@@ -55,24 +144,53 @@ def get_wavelength_calibration(filter_comb, wave_calib, centers, wave_min, wave_
         Array with the linear calibration for each field, as a function
         of pixel coordinate
     '''
-    wave_map = np.zeros((2, 1024, 1024))
-    wave_map[0] = wave_calib[:, 0:1024]
-    wave_map[1] = wave_calib[:, 1024:]
-    wave_map[(wave_map < wave_min) | (wave_max < wave_map)] = np.nan
+    # work on non-copying views of the 20-column slab around the center
+    # of each field; the masking step makes the only (small) copies
+    wave_ext = 10
+    lo0 = centers[0, 0] - wave_ext
+    lo1 = 1024 + centers[1, 0] - wave_ext
+    s0 = wave_calib[:, lo0:lo0+2*wave_ext]
+    s1 = wave_calib[:, lo1:lo1+2*wave_ext]
 
-    if filter_comb == 'S_LR':
-        wave_map[:, 630:] = np.nan
-        wave_map[:, :400] = np.nan
+    m0 = np.where((wave_min <= s0) & (s0 <= wave_max), s0, np.nan)
+    m1 = np.where((wave_min <= s1) & (s1 <= wave_max), s1, np.nan)
 
-    wave_ext = 10
-    wave_lin = np.zeros((2, 1024))
+    if filter_comb == 'S_LR':
+        m0[630:] = np.nan
+        m0[:400] = np.nan
+        m1[630:] = np.nan
+        m1[:400] = np.nan
 
-    wave_lin[0] = np.mean(wave_map[0, :, centers[0, 0]-wave_ext:centers[0, 0]+wave_ext], axis=1)
-    wave_lin[1] = np.mean(wave_map[1, :, centers[1, 0]-wave_ext:centers[1, 0]+wave_ext], axis=1)
+    # fully-masked rows yield NaN, as before; silence the associated
+    # mean-of-empty-slice warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        wave_lin = np.stack((np.nanmean(m0, axis=1), np.nanmean(m1, axis=1)))
 
     return wave_lin
 
 
+def _write_cube(filename, cube):
+    '''
+    Write a science cube to disk as big-endian float32
+
+    Converting to the FITS byte order explicitly gives astropy a buffer
+    it can write as-is, instead of byteswapping the whole cube into an
+    internal copy inside writeto.
+
+    Parameters
+    ----------
+    filename : Path
+        Path of the FITS file
+
+    cube : array
+        Cube to be saved
+    '''
+
+    hdu = fits.PrimaryHDU(np.ascontiguousarray(cube, dtype='>f4'))
+    hdu.writeto(filename, overwrite=True, checksum=False, output_verify='ignore')
+
+
 class SpectroReduction(object):
     '''
     SPHERE/IRDIS long-slit spectroscopy reduction class. It handles
@@ -199,6 +317,13 @@ class SpectroReduction(object):
         reduction._wave_min_mrs = eval(config.get('calibration-spectro', 'wave_min_mrs'))
         reduction._wave_max_mrs = eval(config.get('calibration-spectro', 'wave_max_mrs'))
 
+        # resolution-specific parameters grouped by filter combination,
+        # for direct lookup in the recipes
+        reduction._filter_params = {
+            'S_LR': (reduction._default_center_lrs, reduction._wave_min_lrs, reduction._wave_max_lrs),
+            'S_MR': (reduction._default_center_mrs, reduction._wave_min_mrs, reduction._wave_max_mrs),
+        }
+
         # reduction parameters
         reduction._config = {}
         for group in ['reduction', 'reduction-spectro']:
@@ -206,11 +331,15 @@ class SpectroReduction(object):
             reduction._config.update(items)
             for key, value in items.items():
                 try:
-                    val = eval(value)
-                except NameError:
+                    val = ast.literal_eval(value)
+                except (ValueError, SyntaxError):
                     val = value
                 reduction._config[key] = val
 
+        # resolve esorex once: the recipes reuse the full path instead of
+        # re-scanning $PATH at every call
+        reduction._esorex = shutil.which('esorex')
+
         #
         # reduction and recipes status
         #
@@ -306,43 +435,21 @@ class SpectroReduction(object):
         # dictionary
         dico = self.config
 
-        # misc parameters
+        # bucket the keys by parameter group in a single pass over the
+        # dictionary; sorting makes the output deterministic
+        buckets = {prefix: [] for prefix in ('misc', 'preproc', 'center', 'wave', 'combine', 'clean')}
+        for key in dico:
+            for prefix in buckets:
+                if key.startswith(prefix):
+                    buckets[prefix].append(key)
+                    break
+
         print()
         print('{0:<30s}{1}'.format('Parameter', 'Value'))
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('misc')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
-
-        # pre-processing
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('preproc')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
-
-        # centring
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('center')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
-
-        # wave
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('wave')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
-
-        # combining
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('combine')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
-
-        # clean
-        print('-'*35)
-        keys = [key for key in dico if key.startswith('clean')]
-        for key in keys:
-            print('{0:<30s}{1}'.format(key, dico[key]))
+        for keys in buckets.values():
+            print('-'*35)
+            for key in sorted(keys):
+                print('{0:<30s}{1}'.format(key, dico[key]))
         print('-'*35)
 
         print()
@@ -367,11 +474,11 @@ class SpectroReduction(object):
 
         self._logger.info('====> Static calibrations <====')
 
-        config = self.config
+        silent = self._config['misc_silent_esorex']
 
-        self.sph_ird_cal_dark(silent=config['misc_silent_esorex'])
-        self.sph_ird_cal_detector_flat(silent=config['misc_silent_esorex'])
-        self.sph_ird_cal_wave(silent=config['misc_silent_esorex'])
+        self.sph_ird_cal_dark(silent=silent)
+        self.sph_ird_cal_detector_flat(silent=silent)
+        self.sph_ird_cal_wave(silent=silent)
 
 
     def preprocess_science(self):
@@ -381,7 +488,7 @@ class SpectroReduction(object):
 
         self._logger.info('====> Science pre-processing <====')
 
-        config = self.config
+        config = self._config
 
         self.sph_ird_preprocess_science(subtract_background=config['preproc_subtract_background'],
                                         fix_badpix=config['preproc_fix_badpix'],
@@ -398,7 +505,7 @@ class SpectroReduction(object):
 
         self._logger.info('====> Science processing <====')
 
-        config = self.config
+        config = self._config
 
         self.sph_ird_star_center(high_pass=config['center_high_pass'],
                                  box_psf=config['center_box_psf'],
@@ -423,7 +530,7 @@ class SpectroReduction(object):
 
         self._logger.info('====> Clean-up <====')
 
-        config = self.config
+        config = self._config
 
         if config['clean']:
             self.sph_ird_clean(delete_raw=config['clean_delete_raw'],
@@ -475,20 +582,18 @@ class SpectroReduction(object):
         if fname.exists():
             self._logger.debug('> read files.csv')
 
-            files_info = pd.read_csv(fname, index_col=0)
-
-            # convert times
-            files_info['DATE-OBS'] = pd.to_datetime(files_info['DATE-OBS'], utc=False)
-            files_info['DATE'] = pd.to_datetime(files_info['DATE'], utc=False)
-            files_info['DET FRAM UTC'] = pd.to_datetime(files_info['DET FRAM UTC'], utc=False)
+            files_info = _read_csv_cached(str(fname), fname.stat().st_mtime, 0,
+                                          ('DATE-OBS', 'DATE', 'DET FRAM UTC')).copy()
 
-            # update recipe execution
+            # update recipe execution; a single scan of the PRO CATG
+            # column is enough to check for all calibration products
             self._update_recipe_status('sort_files', sphere.SUCCESS)
-            if np.any(files_info['PRO CATG'] == 'IRD_MASTER_DARK'):
+            procs = set(files_info['PRO CATG'].dropna().unique())
+            if 'IRD_MASTER_DARK' in procs:
                 self._update_recipe_status('sph_ird_cal_dark', sphere.SUCCESS)
-            if np.any(files_info['PRO CATG'] == 'IRD_FLAT_FIELD'):
+            if 'IRD_FLAT_FIELD' in procs:
                 self._update_recipe_status('sph_ird_cal_detector_flat', sphere.SUCCESS)
-            if np.any(files_info['PRO CATG'] == 'IRD_WAVECALIB'):
+            if 'IRD_WAVECALIB' in procs:
                 self._update_recipe_status('sph_ird_cal_wave', sphere.SUCCESS)
 
             # update instrument mode
@@ -500,15 +605,9 @@ class SpectroReduction(object):
         if fname.exists():
             self._logger.debug('> read frames.csv')
 
-            frames_info = pd.read_csv(fname, index_col=(0, 1))
-
-            # convert times
-            frames_info['DATE-OBS'] = pd.to_datetime(frames_info['DATE-OBS'], utc=False)
-            frames_info['DATE'] = pd.to_datetime(frames_info['DATE'], utc=False)
-            frames_info['DET FRAM UTC'] = pd.to_datetime(frames_info['DET FRAM UTC'], utc=False)
-            frames_info['TIME START'] = pd.to_datetime(frames_info['TIME START'], utc=False)
-            frames_info['TIME'] = pd.to_datetime(frames_info['TIME'], utc=False)
-            frames_info['TIME END'] = pd.to_datetime(frames_info['TIME END'], utc=False)
+            frames_info = _read_csv_cached(str(fname), fname.stat().st_mtime, (0, 1),
+                                           ('DATE-OBS', 'DATE', 'DET FRAM UTC',
+                                            'TIME START', 'TIME', 'TIME END')).copy()
 
             # update recipe execution
             self._update_recipe_status('sort_frames', sphere.SUCCESS)
@@ -519,15 +618,9 @@ class SpectroReduction(object):
         if fname.exists():
             self._logger.debug('> read frames_preproc.csv')
 
-            frames_info_preproc = pd.read_csv(fname, index_col=(0, 1))
-
-            # convert times
-            frames_info_preproc['DATE-OBS'] = pd.to_datetime(frames_info_preproc['DATE-OBS'], utc=False)
-            frames_info_preproc['DATE'] = pd.to_datetime(frames_info_preproc['DATE'], utc=False)
-            frames_info_preproc['DET FRAM UTC'] = pd.to_datetime(frames_info_preproc['DET FRAM UTC'], utc=False)
-            frames_info_preproc['TIME START'] = pd.to_datetime(frames_info_preproc['TIME START'], utc=False)
-            frames_info_preproc['TIME'] = pd.to_datetime(frames_info_preproc['TIME'], utc=False)
-            frames_info_preproc['TIME END'] = pd.to_datetime(frames_info_preproc['TIME END'], utc=False)
+            frames_info_preproc = _read_csv_cached(str(fname), fname.stat().st_mtime, (0, 1),
+                                                   ('DATE-OBS', 'DATE', 'DET FRAM UTC',
+                                                    'TIME START', 'TIME', 'TIME END')).copy()
         else:
             frames_info_preproc = None
 
@@ -548,23 +641,23 @@ class SpectroReduction(object):
                 self._update_recipe_status('sph_ird_wavelength_recalibration', sphere.SUCCESS)
             self._logger.debug('> sph_ird_wavelength_recalibration status = {}'.format(done))
 
-            done = True
-            files = frames_info_preproc.index
-            for file, idx in files:
-                fname = '{0}_DIT{1:03d}_preproc'.format(file, idx)
-                file = list(path.preproc.glob('{}.fits'.format(fname)))
-                done = done and (len(file) == 1)
+            # existence checks against a single directory listing
+            # instead of one glob per expected file
+            with os.scandir(path.preproc) as entries:
+                existing = {e.name for e in entries if e.name.endswith('.fits')}
+
+            expected = {'{0}_DIT{1:03d}_preproc.fits'.format(file, idx)
+                        for file, idx in frames_info_preproc.index}
+            done = expected.issubset(existing)
             if done:
                 self._update_recipe_status('sph_ird_preprocess_science', sphere.SUCCESS)
             self._logger.debug('> sph_ird_preprocess_science status = {}'.format(done))
 
-            done = True
             files = frames_info_preproc[(frames_info_preproc['DPR TYPE'] == 'OBJECT,FLUX') |
                                         (frames_info_preproc['DPR TYPE'] == 'OBJECT,CENTER')].index
-            for file, idx in files:
-                fname = '{0}_DIT{1:03d}_preproc_centers'.format(file, idx)
-                file = list(path.preproc.glob('{}.fits'.format(fname)))
-                done = done and (len(file) == 1)
+            expected = {'{0}_DIT{1:03d}_preproc_centers.fits'.format(file, idx)
+                        for file, idx in files}
+            done = expected.issubset(existing)
             if done:
                 self._update_recipe_status('sph_ird_star_center', sphere.SUCCESS)
             self._logger.debug('> sph_ird_star_center status = {}'.format(done))
@@ -624,36 +717,27 @@ class SpectroReduction(object):
 
         # read list of keywords
         self._logger.debug('> read keyword list')
-        keywords = []
-        file = open(Path(sphere.__file__).parent / 'instruments' / 'keywords_irdifs.dat', 'r')
-        for line in file:
-            line = line.strip()
-            if line:
-                if line[0] != '#':
-                    keywords.append(line)
-        file.close()
-
-        # short keywords
-        self._logger.debug('> translate into short keywords')
-        keywords_short = keywords.copy()
-        for idx in range(len(keywords_short)):
-            key = keywords_short[idx]
-            if key.find('HIERARCH ESO ') != -1:
-                keywords_short[idx] = key[13:]
-
-        # files table
-        self._logger.debug('> create files_info data frame')
-        files_info = pd.DataFrame(index=pd.Index(files, name='FILE'), columns=keywords_short, dtype='float')
+        keywords, keywords_short = _read_keywords()
 
+        # read FITS keywords; the headers are read concurrently because
+        # this step is dominated by I/O latency, and the rows are
+        # accumulated so that the data frame can be built in one go
+        # instead of with per-cell assignments
         self._logger.debug('> read FITS keywords')
-        for f in files:
-            hdu = fits.open(path.raw / '{}.fits'.format(f))
-            hdr = hdu[0].header
 
-            for k, sk in zip(keywords, keywords_short):
-                files_info.loc[f, sk] = hdr.get(k)
+        def read_header(f):
+            hdr = fits.getheader(path.raw / '{}.fits'.format(f), ext=0,
+                                 memmap=False, ignore_missing_end=True)
+
+            return {sk: hdr.get(k) for k, sk in zip(keywords, keywords_short)}
+
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            rows = list(executor.map(read_header, files))
 
-            hdu.close()
+        # files table
+        self._logger.debug('> create files_info data frame')
+        files_info = pd.DataFrame.from_records(rows, index=pd.Index(files, name='FILE'), columns=keywords_short)
+        files_info = files_info.infer_objects()
 
         # drop files that are not handled, based on DPR keywords
         self._logger.debug('> drop unsupported file types')
@@ -680,11 +764,11 @@ class SpectroReduction(object):
         files_info.insert(len(files_info.columns), 'PROCESSED', False)
         files_info.insert(len(files_info.columns), 'PRO CATG', ' ')
 
-        # convert times
+        # convert times; the explicit format avoids pandas' per-value
+        # format inference
         self._logger.debug('> convert times')
-        files_info['DATE-OBS'] = pd.to_datetime(files_info['DATE-OBS'], utc=False)
-        files_info['DATE'] = pd.to_datetime(files_info['DATE'], utc=False)
-        files_info['DET FRAM UTC'] = pd.to_datetime(files_info['DET FRAM UTC'], utc=False)
+        for col in ('DATE-OBS', 'DATE', 'DET FRAM UTC'):
+            files_info[col] = pd.to_datetime(files_info[col], utc=False, format='ISO8601', cache=True)
 
         # update instrument mode
         self._mode = files_info.loc[files_info['DPR CATG'] == 'SCIENCE', 'INS1 MODE'][0]
@@ -727,14 +811,11 @@ class SpectroReduction(object):
         # science files
         sci_files = files_info[(files_info['DPR CATG'] == 'SCIENCE') & (files_info['DPR TYPE'] != 'SKY')]
 
-        # build indices
-        files = []
-        img   = []
-        for file, finfo in sci_files.iterrows():
-            NDIT = int(finfo['DET NDIT'])
-
-            files.extend(np.repeat(file, NDIT))
-            img.extend(list(np.arange(NDIT)))
+        # build indices: each file contributes NDIT frames numbered
+        # 0..NDIT-1, computed without iterating the data frame
+        ndit  = sci_files['DET NDIT'].astype(int).to_numpy()
+        files = np.repeat(sci_files.index.to_numpy(), ndit)
+        img   = np.arange(ndit.sum()) - np.repeat(np.concatenate(([0], np.cumsum(ndit)[:-1])), ndit)
 
         # create new dataframe
         self._logger.debug('> create frames_info data frame')
@@ -888,14 +969,13 @@ class SpectroReduction(object):
             warning_flag += 1
             self._logger.warning(' * there should be 1 wavelength calibration file, found {0}. Using the closest from science.'.format(len(cfiles)))
 
-            # find the two closest to science files
+            # find the closest to science files
             sci_files = files_info[(files_info['DPR CATG'] == 'SCIENCE')]
-            time_sci   = sci_files['DATE-OBS'].min()
-            time_flat  = cfiles['DATE-OBS']
-            time_delta = np.abs(time_sci - time_flat).argsort()
+            time_sci  = sci_files['DATE-OBS'].min()
+            keep      = (cfiles['DATE-OBS'] - time_sci).abs().idxmin()
 
             # drop the others
-            files_info.drop(time_delta[1:].index, inplace=True)
+            files_info.drop(cfiles.index.difference([keep]), inplace=True)
 
         ##################################################
         # static calibrations that depend on science DIT
@@ -968,97 +1048,78 @@ class SpectroReduction(object):
                              (files_info['DPR TYPE'] == 'DARK,BACKGROUND') |
                              (files_info['DPR TYPE'] == 'SKY'))]
 
-        # loops on type and DIT value
-        types = ['DARK', 'DARK,BACKGROUND', 'SKY']
-        DITs = calibs['DET SEQ1 DIT'].unique().round(2)
-        filter_combs = calibs['INS COMB IFLT'].unique()
+        # group the calibration frames by type, DIT and filter in a
+        # single pass instead of scanning calibs once per combination
+        groups = calibs.groupby([calibs['DPR TYPE'],
+                                 calibs['DET SEQ1 DIT'].round(2),
+                                 calibs['INS COMB IFLT']], sort=False)
 
-        for ctype in types:
-            for DIT in DITs:
-                for cfilt in filter_combs:
-                    cfiles = calibs[(calibs['DPR TYPE'] == ctype) & (calibs['DET SEQ1 DIT'].round(2) == DIT) &
-                                    (calibs['INS COMB IFLT'] == cfilt)]
-                    files = cfiles.index
-
-                    # skip non-existing combinations
-                    if len(cfiles) == 0:
-                        continue
-
-                    self._logger.info(' * {0} in filter {1} with DIT={2:.2f} sec ({3} files)'.format(ctype, cfilt, DIT, len(cfiles)))
-
-                    # create sof
-                    self._logger.debug('> create sof file')
-                    sof = path.sof / 'dark_filt={0}_DIT={1:.2f}.sof'.format(cfilt, DIT)
-                    file = open(sof, 'w')
-                    for f in files:
-                        file.write('{0}/{1}.fits     {2}\n'.format(path.raw, f, 'IRD_DARK_RAW'))
-                    file.close()
-
-                    # products
-                    if ctype == 'SKY':
-                        loc = 'sky'
-                    else:
-                        loc = 'internal'
-                    dark_file = 'dark_{0}_filt={1}_DIT={2:.2f}'.format(loc, cfilt, DIT)
-                    bpm_file  = 'dark_{0}_bpm_filt={1}_DIT={2:.2f}'.format(loc, cfilt, DIT)
-
-                    # different max level in LRS
-                    max_level = 1000
-                    if cfilt in ['S_LR']:
-                        max_level = 15000
-
-                    # esorex parameters
-                    args = ['esorex',
-                            '--no-checksum=TRUE',
-                            '--no-datamd5=TRUE',
-                            'sph_ird_master_dark',
-                            '--ird.master_dark.sigma_clip=5.0',
-                            '--ird.master_dark.save_addprod=TRUE',
-                            '--ird.master_dark.max_acceptable={0}'.format(max_level),
-                            '--ird.master_dark.outfilename={0}/{1}.fits'.format(path.calib, dark_file),
-                            '--ird.master_dark.badpixfilename={0}/{1}.fits'.format(path.calib, bpm_file),
-                            str(sof)]
-
-                    # check esorex
-                    if shutil.which('esorex') is None:
-                        self._logger.error('esorex does not appear to be in your PATH. Please make sure that the ESO pipeline is properly installed before running vlt-sphere.')
-                        self._update_recipe_status('sph_ird_cal_dark', sphere.ERROR)
-                        return
+        for (ctype, DIT, cfilt), cfiles in groups:
+            files = cfiles.index
 
-                    # execute esorex
-                    self._logger.debug('> execute {}'.format(' '.join(args)))
-                    if silent:
-                        proc = subprocess.run(args, cwd=path.tmp, stdout=subprocess.DEVNULL)
-                    else:
-                        proc = subprocess.run(args, cwd=path.tmp)
+            self._logger.info(' * {0} in filter {1} with DIT={2:.2f} sec ({3} files)'.format(ctype, cfilt, DIT, len(cfiles)))
 
-                    if proc.returncode != 0:
-                        self._logger.error('esorex process was not successful')
-                        self._update_recipe_status('sph_ird_cal_dark', sphere.ERROR)
-                        return
+            # create sof
+            self._logger.debug('> create sof file')
+            sof = path.sof / 'dark_filt={0}_DIT={1:.2f}.sof'.format(cfilt, DIT)
+            sof.write_text(''.join('{0}/{1}.fits     {2}\n'.format(path.raw, f, 'IRD_DARK_RAW')
+                                   for f in files))
+
+            # products
+            if ctype == 'SKY':
+                loc = 'sky'
+            else:
+                loc = 'internal'
+            dark_file = 'dark_{0}_filt={1}_DIT={2:.2f}'.format(loc, cfilt, DIT)
+            bpm_file  = 'dark_{0}_bpm_filt={1}_DIT={2:.2f}'.format(loc, cfilt, DIT)
 
-                    # store products
-                    self._logger.debug('> update files_info data frame')
-                    files_info.loc[dark_file, 'DPR CATG'] = cfiles['DPR CATG'][0]
-                    files_info.loc[dark_file, 'DPR TYPE'] = cfiles['DPR TYPE'][0]
-                    files_info.loc[dark_file, 'INS COMB IFLT'] = cfiles['INS COMB IFLT'][0]
-                    files_info.loc[dark_file, 'INS4 FILT2 NAME'] = cfiles['INS4 FILT2 NAME'][0]
-                    files_info.loc[dark_file, 'INS1 MODE'] = cfiles['INS1 MODE'][0]
-                    files_info.loc[dark_file, 'INS1 FILT NAME'] = cfiles['INS1 FILT NAME'][0]
-                    files_info.loc[dark_file, 'INS1 OPTI2 NAME'] = cfiles['INS1 OPTI2 NAME'][0]
-                    files_info.loc[dark_file, 'DET SEQ1 DIT'] = cfiles['DET SEQ1 DIT'][0]
-                    files_info.loc[dark_file, 'PROCESSED'] = True
-                    files_info.loc[dark_file, 'PRO CATG'] = 'IRD_MASTER_DARK'
-
-                    files_info.loc[bpm_file, 'DPR CATG'] = cfiles['DPR CATG'][0]
-                    files_info.loc[bpm_file, 'DPR TYPE'] = cfiles['DPR TYPE'][0]
-                    files_info.loc[bpm_file, 'INS COMB IFLT'] = cfiles['INS COMB IFLT'][0]
-                    files_info.loc[bpm_file, 'INS4 FILT2 NAME'] = cfiles['INS4 FILT2 NAME'][0]
-                    files_info.loc[bpm_file, 'INS1 MODE'] = cfiles['INS1 MODE'][0]
-                    files_info.loc[bpm_file, 'INS1 FILT NAME'] = cfiles['INS1 FILT NAME'][0]
-                    files_info.loc[bpm_file, 'INS1 OPTI2 NAME'] = cfiles['INS1 OPTI2 NAME'][0]
-                    files_info.loc[bpm_file, 'PROCESSED'] = True
-                    files_info.loc[bpm_file, 'PRO CATG']  = 'IRD_STATIC_BADPIXELMAP'
+            # different max level in LRS
+            max_level = 1000
+            if cfilt in ['S_LR']:
+                max_level = 15000
+
+            # esorex parameters
+            args = [self._esorex,
+                    '--no-checksum=TRUE',
+                    '--no-datamd5=TRUE',
+                    'sph_ird_master_dark',
+                    '--ird.master_dark.sigma_clip=5.0',
+                    '--ird.master_dark.save_addprod=TRUE',
+                    '--ird.master_dark.max_acceptable={0}'.format(max_level),
+                    '--ird.master_dark.outfilename={0}/{1}.fits'.format(path.calib, dark_file),
+                    '--ird.master_dark.badpixfilename={0}/{1}.fits'.format(path.calib, bpm_file),
+                    str(sof)]
+
+            # check esorex
+            if self._esorex is None:
+                self._logger.error('esorex does not appear to be in your PATH. Please make sure that the ESO pipeline is properly installed before running vlt-sphere.')
+                self._update_recipe_status('sph_ird_cal_dark', sphere.ERROR)
+                return
+
+            # execute esorex
+            self._logger.debug('> execute {}'.format(' '.join(args)))
+            if silent:
+                proc = subprocess.run(args, cwd=path.tmp, stdout=subprocess.DEVNULL)
+            else:
+                proc = subprocess.run(args, cwd=path.tmp)
+
+            if proc.returncode != 0:
+                self._logger.error('esorex process was not successful')
+                self._update_recipe_status('sph_ird_cal_dark', sphere.ERROR)
+                return
+
+            # store products; one row assignment per product instead of
+            # one call per keyword
+            self._logger.debug('> update files_info data frame')
+            cols = ['DPR CATG', 'DPR TYPE', 'INS COMB IFLT', 'INS4 FILT2 NAME',
+                    'INS1 MODE', 'INS1 FILT NAME', 'INS1 OPTI2 NAME']
+            ref = cfiles.iloc[0]
+
+            files_info.loc[dark_file, cols + ['DET SEQ1 DIT', 'PROCESSED', 'PRO CATG']] = \
+                list(ref[cols]) + [ref['DET SEQ1 DIT'], True, 'IRD_MASTER_DARK']
+
+            files_info.loc[bpm_file, cols + ['PROCESSED', 'PRO CATG']] = \
+                list(ref[cols]) + [True, 'IRD_STATIC_BADPIXELMAP']
 
         # save
         self._logger.debug('> save files.csv')
@@ -1115,17 +1176,15 @@ class SpectroReduction(object):
             # create sof
             self._logger.debug('> create sof file')
             sof = path.sof / 'flat_filt={0}.sof'.format(cfilt)
-            file = open(sof, 'w')
-            for f in files:
-                file.write('{0}/{1}.fits     {2}\n'.format(path.raw, f, 'IRD_FLAT_FIELD_RAW'))
-            file.close()
+            sof.write_text(''.join('{0}/{1}.fits     {2}\n'.format(path.raw, f, 'IRD_FLAT_FIELD_RAW')
+                                   for f in files))
 
             # products
             flat_file = 'flat_filt={0}'.format(cfilt)
             bpm_file  = 'flat_bpm_filt={0}'.format(cfilt)
 
             # esorex parameters
-            args = ['esorex',
+            args = [self._esorex,
                     '--no-checksum=TRUE',
                     '--no-datamd5=TRUE',
                     'sph_ird_instrument_flat',
@@ -1135,7 +1194,7 @@ class SpectroReduction(object):
                     str(sof)]
 
             # check esorex
-            if shutil.which('esorex') is None:
+            if self._esorex is None:
                 self._logger.error('esorex does not appear to be in your PATH. Please make sure that the ESO pipeline is properly installed before running vlt-sphere.')
                 self._update_recipe_status('sph_ird_cal_detector_flat', sphere.ERROR)
                 return
@@ -1152,28 +1211,18 @@ class SpectroReduction(object):
                 self._update_recipe_status('sph_ird_cal_detector_flat', sphere.ERROR)
                 return
 
-            # store products
+            # store products; one row assignment per product instead of
+            # one call per keyword
             self._logger.debug('> update files_info data frame')
-            files_info.loc[flat_file, 'DPR CATG'] = cfiles['DPR CATG'][0]
-            files_info.loc[flat_file, 'DPR TYPE'] = cfiles['DPR TYPE'][0]
-            files_info.loc[flat_file, 'INS COMB IFLT'] = cfiles['INS COMB IFLT'][0]
-            files_info.loc[flat_file, 'INS4 FILT2 NAME'] = cfiles['INS4 FILT2 NAME'][0]
-            files_info.loc[flat_file, 'INS1 MODE'] = cfiles['INS1 MODE'][0]
-            files_info.loc[flat_file, 'INS1 FILT NAME'] = cfiles['INS1 FILT NAME'][0]
-            files_info.loc[flat_file, 'INS1 OPTI2 NAME'] = cfiles['INS1 OPTI2 NAME'][0]
-            files_info.loc[flat_file, 'DET SEQ1 DIT'] = cfiles['DET SEQ1 DIT'][0]
-            files_info.loc[flat_file, 'PROCESSED'] = True
-            files_info.loc[flat_file, 'PRO CATG'] = 'IRD_FLAT_FIELD'
-
-            files_info.loc[bpm_file, 'DPR CATG'] = cfiles['DPR CATG'][0]
-            files_info.loc[bpm_file, 'DPR TYPE'] = cfiles['DPR TYPE'][0]
-            files_info.loc[bpm_file, 'INS COMB IFLT'] = cfiles['INS COMB IFLT'][0]
-            files_info.loc[bpm_file, 'INS4 FILT2 NAME'] = cfiles['INS4 FILT2 NAME'][0]
-            files_info.loc[bpm_file, 'INS1 MODE'] = cfiles['INS1 MODE'][0]
-            files_info.loc[bpm_file, 'INS1 FILT NAME'] = cfiles['INS1 FILT NAME'][0]
-            files_info.loc[bpm_file, 'INS1 OPTI2 NAME'] = cfiles['INS1 OPTI2 NAME'][0]
-            files_info.loc[bpm_file, 'PROCESSED'] = True
-            files_info.loc[bpm_file, 'PRO CATG']  = 'IRD_NON_LINEAR_BADPIXELMAP'
+            cols = ['DPR CATG', 'DPR TYPE', 'INS COMB IFLT', 'INS4 FILT2 NAME',
+                    'INS1 MODE', 'INS1 FILT NAME', 'INS1 OPTI2 NAME']
+            ref = cfiles.iloc[0]
+
+            files_info.loc[flat_file, cols + ['DET SEQ1 DIT', 'PROCESSED', 'PRO CATG']] = \
+                list(ref[cols]) + [ref['DET SEQ1 DIT'], True, 'IRD_FLAT_FIELD']
+
+            files_info.loc[bpm_file, cols + ['PROCESSED', 'PRO CATG']] = \
+                list(ref[cols]) + [True, 'IRD_NON_LINEAR_BADPIXELMAP']
 
         # save
         self._logger.debug('> save files.csv')
@@ -1214,8 +1263,12 @@ class SpectroReduction(object):
             self._update_recipe_status('sph_ird_cal_wave', sphere.ERROR)
             return
 
+        # evaluate the shared boolean masks only once
+        processed = files_info['PROCESSED']
+        pro_catg = files_info['PRO CATG']
+
         DIT = wave_file['DET SEQ1 DIT'][0]
-        dark_file = files_info[files_info['PROCESSED'] & (files_info['PRO CATG'] == 'IRD_MASTER_DARK') &
+        dark_file = files_info[processed & (pro_catg == 'IRD_MASTER_DARK') &
                                (files_info['DPR CATG'] == 'CALIB') & (files_info['DET SEQ1 DIT'].round(2) == DIT)]
         if len(dark_file) == 0:
             self._logger.error('There should at least 1 dark file for wavelength calibration. Found none.')
@@ -1223,13 +1276,13 @@ class SpectroReduction(object):
             return
 
         filter_comb = wave_file['INS COMB IFLT'][0]
-        flat_file = files_info[files_info['PROCESSED'] & (files_info['PRO CATG'] == 'IRD_FLAT_FIELD')]
+        flat_file = files_info[processed & (pro_catg == 'IRD_FLAT_FIELD')]
         if len(flat_file) == 0:
             self._logger.error('There should at least 1 flat file for wavelength calibration. Found none.')
             self._update_recipe_status('sph_ird_cal_wave', sphere.ERROR)
             return
 
-        bpm_file = files_info[files_info['PROCESSED'] & (files_info['PRO CATG'] == 'IRD_NON_LINEAR_BADPIXELMAP')]
+        bpm_file = files_info[processed & (pro_catg == 'IRD_NON_LINEAR_BADPIXELMAP')]
         if len(flat_file) == 0:
             self._logger.error('There should at least 1 bad pixel map file for wavelength calibration. Found none.')
             self._update_recipe_status('sph_ird_cal_wave', sphere.ERROR)
@@ -1247,14 +1300,12 @@ class SpectroReduction(object):
             # create standard sof in LRS
             self._logger.debug('> create sof file')
             sof = path.sof / 'wave.sof'
-            file = open(sof, 'w')
-            file.write('{0}/{1}.fits     {2}\n'.format(path.raw, wave_file.index[0], 'IRD_WAVECALIB_RAW'))
-            file.write('{0}/{1}.fits     {2}\n'.format(path.calib, dark_file.index[0], 'IRD_MASTER_DARK'))
-            file.write('{0}/{1}.fits     {2}\n'.format(path.calib, flat_file.index[0], 'IRD_FLAT_FIELD'))
-            file.write('{0}/{1}.fits     {2}\n'.format(path.calib, bpm_file.index[0], 'IRD_STATIC_BADPIXELMAP'))
-            file.close()
-
-            args = ['esorex',
+            sof.write_text('{0}/{1}.fits     {2}\n'.format(path.raw, wave_file.index[0], 'IRD_WAVECALIB_RAW') +
+                           '{0}/{1}.fits     {2}\n'.format(path.calib, dark_file.index[0], 'IRD_MASTER_DARK') +
+                           '{0}/{1}.fits     {2}\n'.format(path.calib, flat_file.index[0], 'IRD_FLAT_FIELD') +
+                           '{0}/{1}.fits     {2}\n'.format(path.calib, bpm_file.index[0], 'IRD_STATIC_BADPIXELMAP'))
+
+            args = [self._esorex,
                     '--no-checksum=TRUE',
                     '--no-datamd5=TRUE',
                     'sph_ird_wave_calib',
@@ -1274,23 +1325,23 @@ class SpectroReduction(object):
             # masking of second order spectrum in MRS
             self._logger.debug('> masking second order')
             wave_fname = wave_file.index[0]
-            wave_data, hdr = fits.getdata(path.raw / '{}.fits'.format(wave_fname), header=True)
-            wave_data = wave_data.squeeze()
-            wave_data[:60, :] = 0
-            fits.writeto(path.preproc / '{}_masked.fits'.format(wave_fname), wave_data, hdr, overwrite=True,
-                         output_verify='silentfix')
+            # copy the raw file and zero the masked rows in place through
+            # a memory-mapped update: only the modified pages are read
+            # back and rewritten, the unchanged rows are never decoded
+            masked_file = path.preproc / '{}_masked.fits'.format(wave_fname)
+            shutil.copyfile(path.raw / '{}.fits'.format(wave_fname), masked_file)
+            with fits.open(masked_file, mode='update', memmap=True) as hdu:
+                hdu[0].data[..., :60, :] = 0
 
             # create sof using the masked file
             self._logger.debug('> create sof file')
             sof = path.sof / 'wave.sof'
-            file = open(sof, 'w')
-            file.write('{0}/{1}_masked.fits {2}\n'.format(path.preproc, wave_fname, 'IRD_WAVECALIB_RAW'))
-            file.write('{0}/{1}.fits        {2}\n'.format(path.calib, dark_file.index[0], 'IRD_MASTER_DARK'))
-            file.write('{0}/{1}.fits        {2}\n'.format(path.calib, flat_file.index[0], 'IRD_FLAT_FIELD'))
-            file.write('{0}/{1}.fits        {2}\n'.format(path.calib, bpm_file.index[0], 'IRD_STATIC_BADPIXELMAP'))
-            file.close()
-
-            args = ['esorex',
+            sof.write_text('{0}/{1}_masked.fits {2}\n'.format(path.preproc, wave_fname, 'IRD_WAVECALIB_RAW') +
+                           '{0}/{1}.fits        {2}\n'.format(path.calib, dark_file.index[0], 'IRD_MASTER_DARK') +
+                           '{0}/{1}.fits        {2}\n'.format(path.calib, flat_file.index[0], 'IRD_FLAT_FIELD') +
+                           '{0}/{1}.fits        {2}\n'.format(path.calib, bpm_file.index[0], 'IRD_STATIC_BADPIXELMAP'))
+
+            args = [self._esorex,
                     '--no-checksum=TRUE',
                     '--no-datamd5=TRUE',
                     'sph_ird_wave_calib',
@@ -1307,7 +1358,7 @@ class SpectroReduction(object):
                     str(sof)]
 
         # check esorex
-        if shutil.which('esorex') is None:
+        if self._esorex is None:
             self._logger.error('esorex does not appear to be in your PATH. Please make sure that the ESO pipeline is properly installed before running vlt-sphere.')
             self._update_recipe_status('sph_ird_cal_wave', sphere.ERROR)
             return
@@ -1324,18 +1375,14 @@ class SpectroReduction(object):
             self._update_recipe_status('sph_ird_cal_wave', sphere.ERROR)
             return
 
-        # store products
+        # store products; one row assignment instead of one call per keyword
         self._logger.debug('> update files_info data frame')
-        files_info.loc[wav_file, 'DPR CATG'] = wave_file['DPR CATG'][0]
-        files_info.loc[wav_file, 'DPR TYPE'] = wave_file['DPR TYPE'][0]
-        files_info.loc[wav_file, 'INS COMB IFLT'] = wave_file['INS COMB IFLT'][0]
-        files_info.loc[wav_file, 'INS4 FILT2 NAME'] = wave_file['INS4 FILT2 NAME'][0]
-        files_info.loc[wav_file, 'INS1 MODE'] = wave_file['INS1 MODE'][0]
-        files_info.loc[wav_file, 'INS1 FILT NAME'] = wave_file['INS1 FILT NAME'][0]
-        files_info.loc[wav_file, 'INS1 OPTI2 NAME'] = wave_file['INS1 OPTI2 NAME'][0]
-        files_info.loc[wav_file, 'DET SEQ1 DIT'] = wave_file['DET SEQ1 DIT'][0]
-        files_info.loc[wav_file, 'PROCESSED'] = True
-        files_info.loc[wav_file, 'PRO CATG'] = 'IRD_WAVECALIB'
+        cols = ['DPR CATG', 'DPR TYPE', 'INS COMB IFLT', 'INS4 FILT2 NAME',
+                'INS1 MODE', 'INS1 FILT NAME', 'INS1 OPTI2 NAME', 'DET SEQ1 DIT']
+        ref = wave_file.iloc[0]
+
+        files_info.loc[wav_file, cols + ['PROCESSED', 'PRO CATG']] = \
+            list(ref[cols]) + [True, 'IRD_WAVECALIB']
 
         # save
         self._logger.debug('> save files.csv')
@@ -1343,14 +1390,7 @@ class SpectroReduction(object):
 
         # store default wavelength calibration in preproc
         self._logger.debug('> compute default wavelength calibration')
-        if filter_comb == 'S_LR':
-            centers  = self._default_center_lrs
-            wave_min = self._wave_min_lrs
-            wave_max = self._wave_max_lrs
-        elif filter_comb == 'S_MR':
-            centers  = self._default_center_mrs
-            wave_min = self._wave_min_mrs
-            wave_max = self._wave_max_mrs
+        centers, wave_min, wave_max = self._filter_params[filter_comb]
 
         wave_calib = fits.getdata(path.calib / '{}.fits'.format(wav_file))
         wave_lin   = get_wavelength_calibration(filter_comb, wave_calib, centers, wave_min, wave_max)
@@ -1422,7 +1462,16 @@ class SpectroReduction(object):
             file.unlink()
 
         # filter combination
-        filter_comb = files_info.loc[files_info['DPR CATG'] == 'SCIENCE', 'INS COMB IFLT'].unique()[0]
+        filter_comb = files_info.loc[files_info['DPR CATG'] == 'SCIENCE', 'INS COMB IFLT'].iat[0]
+
+        # dead regions of the detector, masked in every science frame
+        # and ignored in the bad pixel map
+        dead_mask = np.zeros((1024, 2048), dtype=bool)
+        dead_mask[:15, :]      = True
+        dead_mask[1013:, :]    = True
+        dead_mask[:, :50]      = True
+        dead_mask[:, 941:1078] = True
+        dead_mask[:, 1966:]    = True
 
         # bpm
         if fix_badpix:
@@ -1434,14 +1483,14 @@ class SpectroReduction(object):
                 self._update_recipe_status('sph_ird_preprocess_science', sphere.ERROR)
                 return
 
+            # compute_bad_pixel_map already accumulates in uint8; the
+            # astype is a no-op safety net that keeps the map at 1 byte
+            # per pixel for the per-frame fix_badpix passes
             bpm = toolbox.compute_bad_pixel_map(bpm_files, logger=self._logger)
+            bpm = bpm.astype(np.uint8, copy=False)
 
             # mask dead regions
-            bpm[:15, :]      = 0
-            bpm[1013:, :]    = 0
-            bpm[:, :50]      = 0
-            bpm[:, 941:1078] = 0
-            bpm[:, 1966:]    = 0
+            bpm[dead_mask] = 0
 
         # flat
         flat_file = files_info[files_info['PROCESSED'] & (files_info['PRO CATG'] == 'IRD_FLAT_FIELD') &
@@ -1450,12 +1499,26 @@ class SpectroReduction(object):
             self._logger.error('There should be exactly 1 flat file. Found {0}.'.format(len(flat_file)))
             self._update_recipe_status('sph_ird_preprocess_science', sphere.ERROR)
             return
-        flat = fits.getdata(path.calib / '{}.fits'.format(flat_file.index[0]))
+        flat = fits.getdata(path.calib / '{}.fits'.format(flat_file.index[0])).astype(np.float32, copy=False)
+
+        # the division by the flat is applied to every frame of every
+        # file: precompute the reciprocal once and multiply instead
+        with np.errstate(divide='ignore', invalid='ignore'):
+            flat_inv = np.where(flat != 0, 1.0/flat, 0.0).astype(np.float32)
 
-        # final dataframe
+        # final dataframe; the per-file frames info is collected in a
+        # list and concatenated once at the end instead of growing the
+        # data frame file by file
         self._logger.debug('> create frames_info_preproc data frame')
         index = pd.MultiIndex(names=['FILE', 'IMG'], levels=[[], []], codes=[[], []])
         frames_info_preproc = pd.DataFrame(index=index, columns=frames_info.columns, dtype='float')
+        collected = []
+
+        # group the master darks by type and rounded DIT once, instead of
+        # re-filtering files_info for every science type and DIT
+        self._logger.debug('> group master darks by type and DIT')
+        darks = files_info[files_info['PRO CATG'] == 'IRD_MASTER_DARK']
+        dark_groups = darks.groupby([darks['DPR TYPE'], darks['DET SEQ1 DIT'].round(2)], sort=False)
 
         # loop on the different type of science files
         sci_types = ['OBJECT,CENTER', 'OBJECT,FLUX', 'OBJECT']
@@ -1463,13 +1526,14 @@ class SpectroReduction(object):
         for typ in sci_types:
             # science files
             sci_files = files_info[(files_info['DPR CATG'] == 'SCIENCE') & (files_info['DPR TYPE'] == typ)]
-            sci_DITs = list(sci_files['DET SEQ1 DIT'].round(2).unique())
+            sci_dits = sci_files['DET SEQ1 DIT'].round(2)
+            sci_DITs = list(sci_dits.unique())
 
             if len(sci_files) == 0:
                 continue
 
             for DIT in sci_DITs:
-                sfiles = sci_files[sci_files['DET SEQ1 DIT'].round(2) == DIT]
+                sfiles = sci_files[sci_dits == DIT]
 
                 self._logger.info('{0} files of type {1} with DIT={2} sec'.format(len(sfiles), typ, DIT))
 
@@ -1478,90 +1542,98 @@ class SpectroReduction(object):
                     # normally there should be only one with the proper DIT
                     dfiles = []
                     for d in dark_types:
-                        dfiles = files_info[(files_info['PRO CATG'] == 'IRD_MASTER_DARK') &
-                                            (files_info['DPR TYPE'] == d) & (files_info['DET SEQ1 DIT'].round(2) == DIT)]
-                        if len(dfiles) != 0:
+                        if (d, DIT) in dark_groups.groups:
+                            dfiles = dark_groups.get_group((d, DIT))
                             break
                     self._logger.info('   ==> found {0} corresponding {1} file'.format(len(dfiles), d))
 
                     if len(dfiles) == 0:
                         # issue a warning if absolutely no background is found
                         self._logger.warning('No background has been found. Pre-processing will continue but data quality will likely be affected')
-                        bkg = np.zeros((1024, 2048))
+                        bkg = np.zeros((1024, 2048), dtype=np.float32)
                     elif len(dfiles) == 1:
-                        bkg = fits.getdata(path.calib / '{}.fits'.format(dfiles.index[0]))
+                        bkg = fits.getdata(path.calib / '{}.fits'.format(dfiles.index[0])).astype(np.float32, copy=False)
                     elif len(dfiles) > 1:
                         # FIXME: handle cases when multiple backgrounds are found?
                         self._logger.error('Unexpected number of background files ({0})'.format(len(dfiles)))
                         self._update_recipe_status('sph_ird_preprocess_science', sphere.ERROR)
                         return
 
-                # process files
-                for idx, (fname, finfo) in enumerate(sfiles.iterrows()):
+                # per-file worker; files are independent so they are
+                # processed concurrently below. The numpy and astropy
+                # calls release the GIL, so the pixel work of different
+                # files genuinely overlaps
+                def process_file(item):
+                    idx, fname = item
+
                     # frames_info extract
                     finfo = frames_info.loc[(fname, slice(None)), :]
 
                     self._logger.info(' * file {0}/{1}: {2}, NDIT={3}'.format(idx+1, len(sfiles), fname, len(finfo)))
 
-                    # read data
+                    # read data; the file is memory-mapped so that a
+                    # collapse below streams the frames from disk
+                    # instead of materializing the full cube first
                     self._logger.info('   ==> read data')
-                    img, hdr = fits.getdata(path.raw / '{}.fits'.format(fname), header=True)
-
-                    # add extra dimension to single images to make cubes
-                    if img.ndim == 2:
-                        img = img[np.newaxis, ...]
-
-                    # mask dead regions
-                    img[:, :15, :]      = np.nan
-                    img[:, 1013:, :]    = np.nan
-                    img[:, :, :50]      = np.nan
-                    img[:, :, 941:1078] = np.nan
-                    img[:, :, 1966:]    = np.nan
-
-                    # collapse
-                    if (typ == 'OBJECT,CENTER'):
-                        if collapse_center:
-                            self._logger.info('   ==> collapse: mean')
-                            img = np.mean(img, axis=0, keepdims=True)
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
-                        else:
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
-                    elif (typ == 'OBJECT,FLUX'):
-                        if collapse_psf:
-                            self._logger.info('   ==> collapse: mean')
-                            img = np.mean(img, axis=0, keepdims=True)
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
-                        else:
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
-                    elif (typ == 'OBJECT'):
-                        if collapse_science:
-                            self._logger.info('   ==> collapse: mean ({0} -> 1 frame, 0 dropped)'.format(len(img)))
-                            img = np.mean(img, axis=0, keepdims=True)
-
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
-                        else:
-                            frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
+                    with fits.open(path.raw / '{}.fits'.format(fname), memmap=True) as hdu:
+                        hdr = hdu[0].header
+                        img = hdu[0].data
+
+                        # add extra dimension to single images to make cubes
+                        if img.ndim == 2:
+                            img = img[np.newaxis, ...]
+
+                        # collapse; the mean is computed as a single-pass
+                        # float32 sum followed by a multiply: a float32
+                        # accumulator is exact for 16-bit raw data and
+                        # avoids the float64 intermediate of np.mean
+                        if (typ == 'OBJECT,CENTER'):
+                            if collapse_center:
+                                self._logger.info('   ==> collapse: mean')
+                                img = np.add.reduce(img, axis=0, dtype=np.float32, keepdims=True) * (1.0/img.shape[0])
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
+                            else:
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
+                        elif (typ == 'OBJECT,FLUX'):
+                            if collapse_psf:
+                                self._logger.info('   ==> collapse: mean')
+                                img = np.add.reduce(img, axis=0, dtype=np.float32, keepdims=True) * (1.0/img.shape[0])
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
+                            else:
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
+                        elif (typ == 'OBJECT'):
+                            if collapse_science:
+                                self._logger.info('   ==> collapse: mean ({0} -> 1 frame, 0 dropped)'.format(len(img)))
+                                img = np.add.reduce(img, axis=0, dtype=np.float32, keepdims=True) * (1.0/img.shape[0])
+
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'mean', logger=self._logger)
+                            else:
+                                frames_info_new = toolbox.collapse_frames_info(finfo, fname, 'none', logger=self._logger)
+
+                        # the whole pipeline works in float32: halves the
+                        # memory bandwidth of all the pixel operations
+                        # below, and pulls the (possibly memory-mapped)
+                        # data into a contiguous in-memory buffer
+                        img = np.ascontiguousarray(img, dtype=np.float32)
+
+                    # mask dead regions; for the collapsed cubes this is
+                    # equivalent to masking before the collapse, since
+                    # the masked pixels are the same on every frame
+                    img[:, dead_mask] = np.nan
 
                     # check for any error during collapse of frame information
                     if frames_info_new is None:
-                        self._logger.error('An error occured when collapsing frames info')
-                        self._update_recipe_status('sph_ird_preprocess_science', sphere.ERROR)
-                        return
-                    
-                    # merge frames info
-                    frames_info_preproc = pd.concat((frames_info_preproc, frames_info_new))
+                        return None
 
                     # background subtraction
                     if subtract_background:
                         self._logger.info('   ==> subtract background')
-                        for f in range(len(img)):
-                            img[f] -= bkg
+                        img -= bkg
 
                     # divide flat
                     if subtract_background:
                         self._logger.info('   ==> divide by flat field')
-                        for f in range(len(img)):
-                            img[f] /= flat
+                        img *= flat_inv
 
                     # bad pixels correction
                     if fix_badpix:
@@ -1577,25 +1649,49 @@ class SpectroReduction(object):
 
                             img[f] = frame
 
-                    # reshape data
+                    # reshape data: expose the two 1024x1024 fields of
+                    # each frame as a stride view, without copying
                     self._logger.info('   ==> reshape data')
                     NDIT = img.shape[0]
-                    nimg = np.zeros((NDIT, 2, 1024, 1024))
-                    for f in range(len(img)):
-                        nimg[f, 0] = img[f, :, 0:1024]
-                        nimg[f, 1] = img[f, :, 1024:]
+                    nimg = img.reshape(NDIT, 1024, 2, 1024).swapaxes(1, 2)
                     img = nimg
 
-                    # save DITs individually
+                    # save DITs individually; the writes are dispatched
+                    # to a thread pool since the GIL is released during
+                    # the actual I/O. The header is only read by the
+                    # workers
                     self._logger.debug('> save pre-processed images')
-                    for f in range(len(img)):
+                    hdr['HIERARCH ESO DET NDIT'] = 1
+
+                    def write_dit(f):
                         frame = nimg[f, ...].squeeze()
-                        hdr['HIERARCH ESO DET NDIT'] = 1
                         fits.writeto(path.preproc / '{}_DIT{:03d}_preproc.fits'.format(fname, f), frame, hdr,
                                      overwrite=True, output_verify='silentfix')
 
+                    with ThreadPoolExecutor(max_workers=min(8, len(img))) as executor:
+                        list(executor.map(write_dit, range(len(img))))
+
+                    return frames_info_new
+
+                # process files concurrently and merge the frames info
+                # in file order
+                with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, len(sfiles))) as executor:
+                    results = list(executor.map(process_file, enumerate(sfiles.index)))
+
+                for frames_info_new in results:
+                    # check for any error during collapse of frame information
+                    if frames_info_new is None:
+                        self._logger.error('An error occured when collapsing frames info')
+                        self._update_recipe_status('sph_ird_preprocess_science', sphere.ERROR)
+                        return
+
+                    # merge frames info
+                    collected.append(frames_info_new)
+
         # sort and save final dataframe
         self._logger.debug('> save frames_info_preproc.csv')
+        if collected:
+            frames_info_preproc = pd.concat(collected)
         frames_info_preproc.sort_values(by='TIME', inplace=True)
         frames_info_preproc.to_csv(path.preproc / 'frames_preproc.csv')
 
@@ -1643,15 +1739,8 @@ class SpectroReduction(object):
         frames_info = self.frames_info_preproc
 
         # resolution-specific parameters
-        filter_comb = frames_info['INS COMB IFLT'].unique()[0]
-        if filter_comb == 'S_LR':
-            centers  = self._default_center_lrs
-            wave_min = self._wave_min_lrs
-            wave_max = self._wave_max_lrs
-        elif filter_comb == 'S_MR':
-            centers  = self._default_center_mrs
-            wave_min = self._wave_min_mrs
-            wave_max = self._wave_max_mrs
+        filter_comb = frames_info['INS COMB IFLT'].iat[0]
+        centers, wave_min, wave_max = self._filter_params[filter_comb]
 
         # wavelength map
         self._logger.debug('> compute default wavelength calibration')
@@ -1769,15 +1858,8 @@ class SpectroReduction(object):
             wfile.unlink()
 
         # resolution-specific parameters
-        filter_comb = frames_info['INS COMB IFLT'].unique()[0]
-        if filter_comb == 'S_LR':
-            centers  = self._default_center_lrs
-            wave_min = self._wave_min_lrs
-            wave_max = self._wave_max_lrs
-        elif filter_comb == 'S_MR':
-            centers  = self._default_center_mrs
-            wave_min = self._wave_min_mrs
-            wave_max = self._wave_max_mrs
+        filter_comb = frames_info['INS COMB IFLT'].iat[0]
+        centers, wave_min, wave_max = self._filter_params[filter_comb]
 
         # wavelength map
         self._logger.debug('> compute default wavelength calibration')
@@ -1802,19 +1884,87 @@ class SpectroReduction(object):
         if plot:
             pdf = PdfPages(path.products / 'wavelength_recalibration.pdf')
 
+            # the diagnostic pages are rendered on a single background
+            # thread so that the rasterization overlaps with the next
+            # field's computations; each page uses its own Figure, so
+            # the global pyplot state is never touched from the worker
+            plot_executor = ThreadPoolExecutor(max_workers=1)
+            plot_futures  = []
+
         pix = np.arange(1024)
+
+        def render_field(fidx, imin, wave, wave_final_raw, wave_final_fit,
+                         use_d, use_r, use_f, xmin, xmax):
+            fig = plt.Figure(figsize=(10, 10))
+
+            ax = fig.add_subplot(211)
+            ax.axvline(imin, color='k', linestyle='--')
+            ax.plot(pix, wave, label='DRH'+use_d, color='r', lw=3)
+            ax.plot(pix, wave_final_raw, label='Recalibrated [raw]'+use_r)
+            ax.plot(pix, wave_final_fit, label='Recalibrated [fit]'+use_f)
+            ax.legend(loc='upper left')
+            ax.set_ylabel('Wavelength r[nm]')
+            ax.set_title('Field #{}'.format(fidx))
+            ax.set_xlim(xmin, xmax)
+            ax.set_ylim(900, 2400)
+            ax.xaxis.set_ticklabels([])
+
+            ax = fig.add_subplot(212)
+            ax.axvline(imin, color='k', linestyle='--')
+            ax.plot(pix, wave-wave_final_raw)
+            ax.plot(pix, wave-wave_final_fit)
+            ax.set_ylabel('Residuals r[nm]')
+            ax.set_xlabel('Detector coordinate [pix]')
+            ax.set_xlim(xmin, xmax)
+            ax.set_ylim(-100, 100)
+
+            fig.subplots_adjust(left=0.13, right=0.97, bottom=0.08, top=0.96, hspace=0.05)
+
+            pdf.savefig(fig)
         wave_final = np.zeros((1024, 2))
+
+        # compute pass: scaling factors of both fields. The search for
+        # the reference wavelength runs in a single in-place pass over a
+        # scratch buffer shared by the two fields, with NaN mapped to
+        # +inf so that argmin ignores the masked pixels
+        self._logger.debug('> compute wavelength scaling factors')
+        imin_all = np.empty(2, dtype=int)
+        diff     = np.empty(wave_lin.shape[-1])
+        for fidx in range(2):
+            np.subtract(wave_lin[fidx], wave_ref, out=diff)
+            np.fabs(diff, out=diff)
+            np.copyto(diff, np.inf, where=~np.isfinite(diff))
+            imin_all[fidx] = diff.argmin()
+
+        scaling_raw_all = spot_dist.T / spot_dist[imin_all, [0, 1]][:, np.newaxis]
+
+        if filter_comb == 'S_MR':
+            # linear fit with a 5-degree polynomial; both fields are
+            # solved at once through the masked normal equations on a
+            # shared Vandermonde matrix instead of one np.polyfit per
+            # field. The columns are normalized, as in np.polyfit, to
+            # keep the systems well-conditioned
+            self._logger.debug('> batched polynomial fit for recalibration')
+            vander = np.vander(pix, 6)
+            vn     = vander / np.sqrt(np.square(vander).sum(axis=0))
+
+            good_all    = np.isfinite(wave_lin)
+            scaling_all = np.where(good_all, scaling_raw_all, 0)
+
+            lhs   = vn * good_all[..., np.newaxis]
+            ata   = np.einsum('fij,fik->fjk', lhs, lhs)
+            atb   = np.einsum('fij,fi->fj', lhs, scaling_all)
+            coefs = np.linalg.solve(ata, atb[..., np.newaxis])[..., 0]
+
+            scaling_fit_all = (vn @ coefs.T).T
+
         for fidx in range(2):
             self._logger.info('   ==> field {0:2d}/{1:2d}'.format(fidx+1, 2))
 
             wave = wave_lin[fidx]
-            dist = spot_dist[:, fidx]
-
-            imin = np.nanargmin(np.abs(wave-wave_ref))
 
-            # scaling factor
-            self._logger.debug('> compute wavelength scaling factor')
-            scaling_raw = dist / dist[imin]
+            imin        = imin_all[fidx]
+            scaling_raw = scaling_raw_all[fidx]
 
             self._logger.debug('> polynomial fit for recalibration')
             if filter_comb == 'S_LR':
@@ -1824,11 +1974,7 @@ class SpectroReduction(object):
                 wave_final_raw = wave[imin] * scaling_raw
                 wave_final_fit = wave
             elif filter_comb == 'S_MR':
-                # linear fit with a 5-degree polynomial
-                good = np.where(np.isfinite(wave))
-                p = np.polyfit(pix[good], scaling_raw[good], 5)
-
-                scaling_fit = np.polyval(p, pix)
+                scaling_fit = scaling_fit_all[fidx]
 
                 wave_final_raw = wave[imin] * scaling_raw
                 wave_final_fit = wave[imin] * scaling_fit
@@ -1837,8 +1983,11 @@ class SpectroReduction(object):
             wave_final_raw[bad] = np.nan
             wave_final_fit[bad] = np.nan
 
-            wave_diff = np.abs(wave_final_fit - wave)
-            self._logger.info('   ==> difference with calibrated wavelength: min={0:.1f} nm, max={1:.1f} nm'.format(np.nanmin(wave_diff), np.nanmax(wave_diff)))
+            # reuse the scratch buffer from the scaling-factor search
+            # to compute the difference in place
+            np.subtract(wave_final_fit, wave, out=diff)
+            np.fabs(diff, out=diff)
+            self._logger.info('   ==> difference with calibrated wavelength: min={0:.1f} nm, max={1:.1f} nm'.format(np.nanmin(diff), np.nanmax(diff)))
 
             if filter_comb == 'S_LR':
                 # use DRH
@@ -1868,36 +2017,16 @@ class SpectroReduction(object):
                 elif filter_comb == 'S_MR':
                     xmin = 1024
                     xmax = 0
-                
-                plt.figure('Wavelength recalibration', figsize=(10, 10))
-                plt.clf()
-
-                plt.subplot(211)
-                plt.axvline(imin, color='k', linestyle='--')
-                plt.plot(pix, wave, label='DRH'+use_d, color='r', lw=3)
-                plt.plot(pix, wave_final_raw, label='Recalibrated [raw]'+use_r)
-                plt.plot(pix, wave_final_fit, label='Recalibrated [fit]'+use_f)
-                plt.legend(loc='upper left')
-                plt.ylabel('Wavelength r[nm]')
-                plt.title('Field #{}'.format(fidx))
-                plt.xlim(xmin, xmax)
-                plt.ylim(900, 2400)
-                plt.gca().xaxis.set_ticklabels([])
-
-                plt.subplot(212)
-                plt.axvline(imin, color='k', linestyle='--')
-                plt.plot(pix, wave-wave_final_raw)
-                plt.plot(pix, wave-wave_final_fit)
-                plt.ylabel('Residuals r[nm]')
-                plt.xlabel('Detector coordinate [pix]')
-                plt.xlim(xmin, xmax)
-                plt.ylim(-100, 100)
-
-                plt.subplots_adjust(left=0.13, right=0.97, bottom=0.08, top=0.96, hspace=0.05)
-
-                pdf.savefig()
+
+                plot_futures.append(plot_executor.submit(render_field, fidx, imin, wave,
+                                                         wave_final_raw, wave_final_fit,
+                                                         use_d, use_r, use_f, xmin, xmax))
 
         if plot:
+            # wait for the background renders before closing the PDF
+            for future in plot_futures:
+                future.result()
+            plot_executor.shutdown()
             pdf.close()
 
         # save
@@ -2018,15 +2147,8 @@ class SpectroReduction(object):
         frames_info = self.frames_info_preproc
 
         # resolution-specific parameters
-        filter_comb = frames_info['INS COMB IFLT'].unique()[0]
-        if filter_comb == 'S_LR':
-            default_center = self._default_center_lrs
-            wave_min = self._wave_min_lrs
-            wave_max = self._wave_max_lrs
-        elif filter_comb == 'S_MR':
-            default_center = self._default_center_mrs
-            wave_min = self._wave_min_mrs
-            wave_max = self._wave_max_mrs
+        filter_comb = frames_info['INS COMB IFLT'].iat[0]
+        default_center, wave_min, wave_max = self._filter_params[filter_comb]
 
         # read final wavelength calibration
         self._logger.debug('> save final wavelength')
@@ -2046,13 +2168,11 @@ class SpectroReduction(object):
         # wavelength solution: make sure we have the same number of
         # wave points in each field
         mask   = ((wave_min <= wave) & (wave <= wave_max))
-        iwave0 = np.where(mask[:, 0])[0]
-        iwave1 = np.where(mask[:, 1])[0]
-        nwave  = np.min([iwave0.size, iwave1.size])
+        iwave0 = np.flatnonzero(mask[:, 0])
+        iwave1 = np.flatnonzero(mask[:, 1])
+        nwave  = min(iwave0.size, iwave1.size)
 
-        iwave = np.empty((nwave, 2), dtype=np.int)
-        iwave[:, 0] = iwave0[:nwave]
-        iwave[:, 1] = iwave1[:nwave]
+        iwave = np.column_stack((iwave0[:nwave], iwave1[:nwave]))
 
         final_wave = np.empty((nwave, 2))
         final_wave[:, 0] = wave[iwave[:, 0], 0]
@@ -2060,6 +2180,11 @@ class SpectroReduction(object):
 
         fits.writeto(path.products / 'wavelength.fits', final_wave.squeeze().T, overwrite=True)
 
+        # neutral density attenuation, cached by filter and field: the ND
+        # filter is essentially constant across a sequence, so there is
+        # no point recomputing the transmission for every file
+        nd_atten = {}
+
         # max images size
         if psf_dim > 1024:
             self._logger.warning('psf_dim cannot be larger than 1024 pix. A value of 1024 will be used.')
@@ -2069,6 +2194,15 @@ class SpectroReduction(object):
             self._logger.warning('science_dim cannot be larger than 1024 pix. A value of 1024 will be used.')
             science_dim = 1024
 
+        # single scratch buffer shared by the three data types below:
+        # each cube is saved to disk before the next one is filled, so
+        # they can all reuse the same memory instead of keeping up to
+        # three large cubes resident at the same time
+        n_flux = np.sum(frames_info['DPR TYPE'] == 'OBJECT,FLUX')
+        n_cen  = np.sum(frames_info['DPR TYPE'] == 'OBJECT,CENTER')
+        n_sci  = np.sum(frames_info['DPR TYPE'] == 'OBJECT')
+        scratch = np.empty((2, max(n_flux, n_cen, n_sci), nwave, max(psf_dim, science_dim)), dtype=np.float32)
+
         # centering configuration
         if coarse_centering:
             self._logger.warning('Images will be coarsely centered without any interpolation. Automatic settings for coarse centering: shift_method=\'roll\', cpix=True, correct_mrs_chromatism=False')
@@ -2086,7 +2220,7 @@ class SpectroReduction(object):
 
             self._logger.warning('Images will be centered using the user-provided center ({},{})'.format(*manual_center))
 
-            manual_center = np.full((1024, 2), manual_center, dtype=np.float)
+            manual_center = np.full((1024, 2), manual_center, dtype=float)
 
         #
         # OBJECT,FLUX
@@ -2097,8 +2231,14 @@ class SpectroReduction(object):
             self._logger.info(' * OBJECT,FLUX data')
 
             # final arrays
-            psf_cube   = np.zeros((2, nfiles, nwave, psf_dim))
-            psf_posang = np.zeros(nfiles)
+            psf_cube   = scratch[:, :nfiles, :, :psf_dim]
+            psf_cube.fill(0)
+            psf_posang = flux_files['INS4 DROT2 POSANG'].to_numpy() + 90
+
+            # per-file metadata as plain arrays aligned with the file
+            # index, avoiding one MultiIndex lookup per file
+            dits = flux_files['DET SEQ1 DIT'].to_numpy()
+            nds  = flux_files['INS4 FILT2 NAME'].to_numpy()
             
             # final center
             if cpix:
@@ -2106,88 +2246,96 @@ class SpectroReduction(object):
             else:
                 cc = (psf_dim - 1) / 2
 
-            # read and combine files
-            for file_idx, (file, idx) in enumerate(flux_files.index):
+            # per-file worker: each file writes only its own slice of
+            # psf_cube and psf_posang, so the files are read and
+            # combined concurrently below
+            def process_file(item):
+                file_idx, (file, idx) = item
                 self._logger.info('   ==> file {0}/{1}: {2}, DIT #{3}'.format(file_idx+1, len(flux_files), file, idx))
 
                 # read data
                 self._logger.debug('> read data')
                 fname = '{0}_DIT{1:03d}_preproc'.format(file, idx)
-                cube = fits.getdata(path.preproc / '{}.fits'.format(fname))
-
-                self._logger.debug('> read centers')
-                cfile = path.preproc / '{}_centers.fits'.format(fname)
-                if cfile.exists():
-                    centers = fits.getdata(cfile)
-                else:
-                    self._logger.warning('sph_ird_star_center() has not been executed. Images will be centered using default centers ({}, {})'.format(*default_center[:, 0]))
-                    centers = np.full((1024, 2), default_center[:, 0], dtype=np.float)
+                # memory-map the preproc cube: the chromatism branch only
+                # reads the selected wavelength rows from disk
+                with fits.open(path.preproc / '{}.fits'.format(fname), memmap=True,
+                               do_not_scale_image_data=True) as hdu:
+                    cube = hdu[0].data
+
+                    self._logger.debug('> read centers')
+                    cfile = path.preproc / '{}_centers.fits'.format(fname)
+                    if cfile.exists():
+                        centers = fits.getdata(cfile)
+                    else:
+                        self._logger.warning('sph_ird_star_center() has not been executed. Images will be centered using default centers ({}, {})'.format(*default_center[:, 0]))
+                        centers = np.full((1024, 2), default_center[:, 0], dtype=float)
 
-                # make sure we have only integers if user wants coarse centering
-                if coarse_centering:
-                    centers = centers.astype(np.int)
+                    # make sure we have only integers if user wants coarse centering
+                    if coarse_centering:
+                        centers = centers.astype(int)
 
-                # DIT, angles, etc
-                self._logger.debug('> read angles')
-                DIT = frames_info.loc[(file, idx), 'DET SEQ1 DIT']
-                psf_posang[file_idx] = frames_info.loc[(file, idx), 'INS4 DROT2 POSANG'] + 90
+                    # DIT, angles, etc
+                    self._logger.debug('> read angles')
+                    DIT = dits[file_idx]
 
-                # center
-                for field_idx, img in enumerate(cube):
-                    self._logger.debug('> field {}'.format(field_idx))
-                    # wavelength solution for this field
-                    ciwave = iwave[:, field_idx]
+                    # center
+                    for field_idx, img in enumerate(cube):
+                        self._logger.debug('> field {}'.format(field_idx))
+                        # wavelength solution for this field
+                        ciwave = iwave[:, field_idx]
 
-                    if correct_mrs_chromatism and (filter_comb == 'S_MR'):
-                        self._logger.debug('> correct MRS chromatism')
-                        img = img.astype(np.float)
-                        self._logger.debug('> shift and normalize')
-                        for wave_idx, widx in enumerate(ciwave):
-                            cx = centers[widx, field_idx]
+                        if correct_mrs_chromatism and (filter_comb == 'S_MR'):
+                            self._logger.debug('> correct MRS chromatism')
+                            sub = img[ciwave, :].astype(np.float32)
+                            cx  = centers[ciwave, field_idx]
 
-                            line = img[widx, :]
+                            self._logger.debug('> shift and normalize')
+                            nimg = imutils.shift_rows(sub, cc-cx, method=shift_method)
 
-                            nimg = imutils.shift(line, cc-cx, method=shift_method)
-                            nimg = nimg / DIT
+                            # normalize only the columns that are kept
+                            np.divide(nimg[:, :psf_dim], DIT, out=psf_cube[field_idx, file_idx])
+                        else:
+                            cx = centers[ciwave, field_idx].mean()
 
-                            psf_cube[field_idx, file_idx, wave_idx] = nimg[:psf_dim]
-                    else:
-                        cx = centers[ciwave, field_idx].mean()
+                            self._logger.debug('> shift and normalize')
+                            img  = img.astype(np.float32, copy=False)
+                            nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
 
-                        self._logger.debug('> shift and normalize')
-                        img  = img.astype(np.float)
-                        nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
-                        nimg = nimg / DIT
+                            # normalize only the rows and columns that
+                            # are kept, instead of dividing the full
+                            # shifted frame
+                            np.divide(nimg[ciwave, :psf_dim], DIT, out=psf_cube[field_idx, file_idx])
 
-                        psf_cube[field_idx, file_idx] = nimg[ciwave, :psf_dim]
+                        # neutral density
+                        self._logger.debug('> compensate for neutral density')
+                        ND = nds[file_idx]
+                        if (ND, field_idx) not in nd_atten:
+                            nd_atten[(ND, field_idx)] = transmission.transmission_nd(ND, wave=final_wave[:, field_idx])[1]
+                        psf_cube[field_idx, file_idx] /= nd_atten[(ND, field_idx)][:, np.newaxis]
 
-                    # neutral density
-                    self._logger.debug('> compensate for neutral density')
-                    cwave  = final_wave[:, field_idx]
-                    ND = frames_info.loc[(file, idx), 'INS4 FILT2 NAME']
-                    w, attenuation = transmission.transmission_nd(ND, wave=cwave)
-                    psf_cube[field_idx, file_idx] = (psf_cube[field_idx, file_idx].T / attenuation).T
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, nfiles)) as executor:
+                list(executor.map(process_file, enumerate(flux_files.index)))
 
             self._logger.debug('> save final cubes and metadata')
             if split_posang:
                 self._logger.debug('> split position angles')
-                pas = np.unique(psf_posang)
-                for pa in pas:
-                    ii = np.where(psf_posang == pa)[0]
+                pas, inv = np.unique(psf_posang, return_inverse=True)
+                for k, pa in enumerate(pas):
+                    ii = np.flatnonzero(inv == k)
 
                     # save metadata
-                    flux_files[(flux_files['INS4 DROT2 POSANG'] + 90) == pa].to_csv(path.products / 'psf_posang={:06.2f}_frames.csv'.format(pa))
+                    flux_files.iloc[ii].to_csv(path.products / 'psf_posang={:06.2f}_frames.csv'.format(pa))
                     fits.writeto(path.products / 'psf_posang={:06.2f}_posang.fits'.format(pa), psf_posang[ii], overwrite=True)
 
                     # save final cubes
-                    fits.writeto(path.products / 'psf_posang={:06.2f}_cube.fits'.format(pa), psf_cube[:, ii], overwrite=True)
+                    _write_cube(path.products / 'psf_posang={:06.2f}_cube.fits'.format(pa), psf_cube[:, ii])
             else:
                 # save metadata
                 flux_files.to_csv(path.products / 'psf_posang=all_frames.csv')
                 fits.writeto(path.products / 'psf_posang=all_posang.fits', psf_posang, overwrite=True)
 
                 # save final cubes
-                fits.writeto(path.products / 'psf_posang=all_cube.fits', psf_cube, overwrite=True)
+                _write_cube(path.products / 'psf_posang=all_cube.fits', psf_cube)
 
             # delete big cubes
             self._logger.debug('> free memory')
@@ -2202,8 +2350,14 @@ class SpectroReduction(object):
             self._logger.info(' * OBJECT,CENTER data')
 
             # final arrays
-            cen_cube   = np.zeros((2, nfiles, nwave, science_dim))
-            cen_posang = np.zeros(nfiles)
+            cen_cube   = scratch[:, :nfiles, :, :science_dim]
+            cen_cube.fill(0)
+            cen_posang = starcen_files['INS4 DROT2 POSANG'].to_numpy() + 90
+
+            # per-file metadata as plain arrays aligned with the file
+            # index, avoiding one MultiIndex lookup per file
+            dits = starcen_files['DET SEQ1 DIT'].to_numpy()
+            nds  = starcen_files['INS4 FILT2 NAME'].to_numpy()
 
             # final center
             if cpix:
@@ -2211,86 +2365,95 @@ class SpectroReduction(object):
             else:
                 cc = (science_dim - 1) / 2
 
-            # read and combine files
-            for file_idx, (file, idx) in enumerate(starcen_files.index):
+            # per-file worker: each file writes only its own slice of
+            # cen_cube and cen_posang, so the files are read and
+            # combined concurrently below
+            def process_file(item):
+                file_idx, (file, idx) = item
                 self._logger.info('   ==> file {0}/{1}: {2}, DIT #{3}'.format(file_idx+1, len(starcen_files), file, idx))
 
                 # read data
                 self._logger.debug('> read data')
                 fname = '{0}_DIT{1:03d}_preproc'.format(file, idx)
-                cube = fits.getdata(path.preproc / '{}.fits'.format(fname))
-
-                # use manual center if explicitely requested
-                self._logger.debug('> read centers')
-                if manual_center is not None:
-                    centers = manual_center
-                else:
-                    centers = fits.getdata(path.preproc / '{}_centers.fits'.format(fname))
-
-                # make sure we have only integers if user wants coarse centering
-                if coarse_centering:
-                    centers = centers.astype(np.int)
-
-                # DIT, angles, etc
-                self._logger.debug('> read angles')
-                DIT = frames_info.loc[(file, idx), 'DET SEQ1 DIT']
-                cen_posang[file_idx] = frames_info.loc[(file, idx), 'INS4 DROT2 POSANG'] + 90
-
-                # center
-                for field_idx, img in enumerate(cube):
-                    self._logger.debug('> field {}'.format(field_idx))
-                    # wavelength solution for this field
-                    ciwave = iwave[:, field_idx]
-
-                    if correct_mrs_chromatism and (filter_comb == 'S_MR'):
-                        self._logger.debug('> correct MRS chromatism')
-                        img = img.astype(np.float)
-                        self._logger.debug('> shift and normalize')
-                        for wave_idx, widx in enumerate(ciwave):
-                            cx = centers[widx, field_idx]
-
-                            line = img[widx, :]
-                            nimg = imutils.shift(line, cc-cx, method=shift_method)
-                            nimg = nimg / DIT
-
-                            cen_cube[field_idx, file_idx, wave_idx] = nimg[:science_dim]
+                # memory-map the preproc cube: the chromatism branch only
+                # reads the selected wavelength rows from disk
+                with fits.open(path.preproc / '{}.fits'.format(fname), memmap=True,
+                               do_not_scale_image_data=True) as hdu:
+                    cube = hdu[0].data
+
+                    # use manual center if explicitely requested
+                    self._logger.debug('> read centers')
+                    if manual_center is not None:
+                        centers = manual_center
                     else:
-                        cx = centers[ciwave, field_idx].mean()
+                        centers = fits.getdata(path.preproc / '{}_centers.fits'.format(fname))
+
+                    # make sure we have only integers if user wants coarse centering
+                    if coarse_centering:
+                        centers = centers.astype(int)
 
-                        self._logger.debug('> shift and normalize')
-                        img  = img.astype(np.float)
-                        nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
-                        nimg = nimg / DIT
+                    # DIT, angles, etc
+                    self._logger.debug('> read angles')
+                    DIT = dits[file_idx]
 
-                        cen_cube[field_idx, file_idx] = nimg[ciwave, :science_dim]
+                    # center
+                    for field_idx, img in enumerate(cube):
+                        self._logger.debug('> field {}'.format(field_idx))
+                        # wavelength solution for this field
+                        ciwave = iwave[:, field_idx]
 
-                    # neutral density
-                    self._logger.debug('> compensate for neutral density')
-                    cwave  = final_wave[:, field_idx]
-                    ND = frames_info.loc[(file, idx), 'INS4 FILT2 NAME']
-                    w, attenuation = transmission.transmission_nd(ND, wave=cwave)
-                    cen_cube[field_idx, file_idx] = (cen_cube[field_idx, file_idx].T / attenuation).T
+                        if correct_mrs_chromatism and (filter_comb == 'S_MR'):
+                            self._logger.debug('> correct MRS chromatism')
+                            sub = img[ciwave, :].astype(np.float32)
+                            cx  = centers[ciwave, field_idx]
+
+                            self._logger.debug('> shift and normalize')
+                            nimg = imutils.shift_rows(sub, cc-cx, method=shift_method)
+
+                            # normalize only the columns that are kept
+                            np.divide(nimg[:, :science_dim], DIT, out=cen_cube[field_idx, file_idx])
+                        else:
+                            cx = centers[ciwave, field_idx].mean()
+
+                            self._logger.debug('> shift and normalize')
+                            img  = img.astype(np.float32, copy=False)
+                            nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
+
+                            # normalize only the rows and columns that
+                            # are kept, instead of dividing the full
+                            # shifted frame
+                            np.divide(nimg[ciwave, :science_dim], DIT, out=cen_cube[field_idx, file_idx])
+
+                        # neutral density
+                        self._logger.debug('> compensate for neutral density')
+                        ND = nds[file_idx]
+                        if (ND, field_idx) not in nd_atten:
+                            nd_atten[(ND, field_idx)] = transmission.transmission_nd(ND, wave=final_wave[:, field_idx])[1]
+                        cen_cube[field_idx, file_idx] /= nd_atten[(ND, field_idx)][:, np.newaxis]
+
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, nfiles)) as executor:
+                list(executor.map(process_file, enumerate(starcen_files.index)))
 
             self._logger.debug('> save final cubes and metadata')
             if split_posang:
                 self._logger.debug('> split position angles')
-                pas = np.unique(cen_posang)
-                for pa in pas:
-                    ii = np.where(cen_posang == pa)[0]
+                pas, inv = np.unique(cen_posang, return_inverse=True)
+                for k, pa in enumerate(pas):
+                    ii = np.flatnonzero(inv == k)
 
                     # save metadata
-                    starcen_files[(starcen_files['INS4 DROT2 POSANG'] + 90) == pa].to_csv(path.products / 'starcenter_posang={:06.2f}_frames.csv'.format(pa))
+                    starcen_files.iloc[ii].to_csv(path.products / 'starcenter_posang={:06.2f}_frames.csv'.format(pa))
                     fits.writeto(path.products / 'starcenter_posang={:06.2f}_posang.fits'.format(pa), cen_posang[ii], overwrite=True)
 
                     # save final cubes
-                    fits.writeto(path.products / 'starcenter_posang={:06.2f}_cube.fits'.format(pa), cen_cube[:, ii], overwrite=True)
+                    _write_cube(path.products / 'starcenter_posang={:06.2f}_cube.fits'.format(pa), cen_cube[:, ii])
             else:
                 # save metadata
                 starcen_files.to_csv(path.products / 'starcenter_posang=all_frames.csv')
                 fits.writeto(path.products / 'starcenter_posang=all_posang.fits', cen_posang, overwrite=True)
 
                 # save final cubes
-                fits.writeto(path.products / 'starcenter_posang=all_cube.fits', cen_cube, overwrite=True)
+                _write_cube(path.products / 'starcenter_posang=all_cube.fits', cen_cube)
 
             # delete big cubes
             del cen_cube
@@ -2304,13 +2467,19 @@ class SpectroReduction(object):
             self._logger.info(' * OBJECT data')
 
             # final arrays
-            sci_cube   = np.zeros((2, nfiles, nwave, science_dim))
-            sci_posang = np.zeros(nfiles)
+            sci_cube   = scratch[:, :nfiles, :, :science_dim]
+            sci_cube.fill(0)
+            sci_posang = object_files['INS4 DROT2 POSANG'].to_numpy() + 90
+
+            # per-file metadata as plain arrays aligned with the file
+            # index, avoiding one MultiIndex lookup per file
+            dits = object_files['DET SEQ1 DIT'].to_numpy()
+            nds  = object_files['INS4 FILT2 NAME'].to_numpy()
 
             # use manual center if explicitely requested
             self._logger.debug('> read centers')
             if manual_center is not None:
-                centers = np.full((1024, 2), manual_center, dtype=np.float)
+                centers = np.full((1024, 2), manual_center, dtype=float)
             else:
                 # FIXME: ticket #12. Use first DIT of first OBJECT,CENTER
                 # in the sequence, but it would be better to be able to
@@ -2318,14 +2487,14 @@ class SpectroReduction(object):
                 starcen_files = frames_info[frames_info['DPR TYPE'] == 'OBJECT,CENTER']
                 if len(starcen_files) == 0:
                     self._logger.warning('No OBJECT,CENTER file in the data set. Images will be centered using default center ({},{})'.format(*default_center[:, 0]))
-                    centers = np.full((1024, 2), default_center[:, 0], dtype=np.float)
+                    centers = np.full((1024, 2), default_center[:, 0], dtype=float)
                 else:
                     fname = '{0}_DIT{1:03d}_preproc_centers.fits'.format(starcen_files.index.values[0][0], starcen_files.index.values[0][1])
                     centers = fits.getdata(path.preproc / fname)
 
             # make sure we have only integers if user wants coarse centering
             if coarse_centering:
-                centers = centers.astype(np.int)
+                centers = centers.astype(int)
 
             # final center
             if cpix:
@@ -2333,75 +2502,84 @@ class SpectroReduction(object):
             else:
                 cc = (science_dim - 1) / 2
 
-            # read and combine files
-            for file_idx, (file, idx) in enumerate(object_files.index):
+            # per-file worker: each file writes only its own slice of
+            # sci_cube and sci_posang, so the files are read and
+            # combined concurrently below
+            def process_file(item):
+                file_idx, (file, idx) = item
                 self._logger.info('   ==> file {0}/{1}: {2}, DIT #{3}'.format(file_idx+1, len(object_files), file, idx))
 
                 # read data
                 self._logger.debug('> read data')
                 fname = '{0}_DIT{1:03d}_preproc'.format(file, idx)
-                cube = fits.getdata(path.preproc / '{}.fits'.format(fname))
-
-                # DIT, angles, etc
-                self._logger.debug('> read angles')
-                DIT = frames_info.loc[(file, idx), 'DET SEQ1 DIT']
-                sci_posang[file_idx] = frames_info.loc[(file, idx), 'INS4 DROT2 POSANG'] + 90
-
-                # center
-                for field_idx, img in enumerate(cube):
-                    self._logger.debug('> field {}'.format(field_idx))
-                    # wavelength solution for this field
-                    ciwave = iwave[:, field_idx]
-
-                    if correct_mrs_chromatism and (filter_comb == 'S_MR'):
-                        self._logger.debug('> correct MRS chromatism')
-                        img = img.astype(np.float)
-                        self._logger.debug('> shift and normalize')
-                        for wave_idx, widx in enumerate(ciwave):
-                            cx = centers[widx, field_idx]
-
-                            line = img[widx, :]
-                            nimg = imutils.shift(line, cc-cx, method=shift_method)
-                            nimg = nimg / DIT
-
-                            sci_cube[field_idx, file_idx, wave_idx] = nimg[:science_dim]
-                    else:
-                        cx = centers[ciwave, field_idx].mean()
+                # memory-map the preproc cube: the chromatism branch only
+                # reads the selected wavelength rows from disk
+                with fits.open(path.preproc / '{}.fits'.format(fname), memmap=True,
+                               do_not_scale_image_data=True) as hdu:
+                    cube = hdu[0].data
+
+                    # DIT, angles, etc
+                    self._logger.debug('> read angles')
+                    DIT = dits[file_idx]
+
+                    # center
+                    for field_idx, img in enumerate(cube):
+                        self._logger.debug('> field {}'.format(field_idx))
+                        # wavelength solution for this field
+                        ciwave = iwave[:, field_idx]
+
+                        if correct_mrs_chromatism and (filter_comb == 'S_MR'):
+                            self._logger.debug('> correct MRS chromatism')
+                            sub = img[ciwave, :].astype(np.float32)
+                            cx  = centers[ciwave, field_idx]
+
+                            self._logger.debug('> shift and normalize')
+                            nimg = imutils.shift_rows(sub, cc-cx, method=shift_method)
+
+                            # normalize only the columns that are kept
+                            np.divide(nimg[:, :science_dim], DIT, out=sci_cube[field_idx, file_idx])
+                        else:
+                            cx = centers[ciwave, field_idx].mean()
+
+                            self._logger.debug('> shift and normalize')
+                            img  = img.astype(np.float32, copy=False)
+                            nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
 
-                        self._logger.debug('> shift and normalize')
-                        img  = img.astype(np.float)
-                        nimg = imutils.shift(img, (cc-cx, 0), method=shift_method)
-                        nimg = nimg / DIT
+                            # normalize only the rows and columns that
+                            # are kept, instead of dividing the full
+                            # shifted frame
+                            np.divide(nimg[ciwave, :science_dim], DIT, out=sci_cube[field_idx, file_idx])
 
-                        sci_cube[field_idx, file_idx] = nimg[ciwave, :science_dim]
+                        # neutral density
+                        self._logger.debug('> compensate for neutral density')
+                        ND = nds[file_idx]
+                        if (ND, field_idx) not in nd_atten:
+                            nd_atten[(ND, field_idx)] = transmission.transmission_nd(ND, wave=final_wave[:, field_idx])[1]
+                        sci_cube[field_idx, file_idx] /= nd_atten[(ND, field_idx)][:, np.newaxis]
 
-                    # neutral density
-                    self._logger.debug('> compensate for neutral density')
-                    cwave  = final_wave[:, field_idx]
-                    ND = frames_info.loc[(file, idx), 'INS4 FILT2 NAME']
-                    w, attenuation = transmission.transmission_nd(ND, wave=cwave)
-                    sci_cube[field_idx, file_idx] = (sci_cube[field_idx, file_idx].T / attenuation).T
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, nfiles)) as executor:
+                list(executor.map(process_file, enumerate(object_files.index)))
 
             self._logger.debug('> save final cubes and metadata')
             if split_posang:
                 self._logger.debug('> split position angles')
-                pas = np.unique(sci_posang)
-                for pa in pas:
-                    ii = np.where(sci_posang == pa)[0]
+                pas, inv = np.unique(sci_posang, return_inverse=True)
+                for k, pa in enumerate(pas):
+                    ii = np.flatnonzero(inv == k)
 
                     # save metadata
-                    object_files[(object_files['INS4 DROT2 POSANG'] + 90) == pa].to_csv(path.products / 'science_posang={:06.2f}_frames.csv'.format(pa))
+                    object_files.iloc[ii].to_csv(path.products / 'science_posang={:06.2f}_frames.csv'.format(pa))
                     fits.writeto(path.products / 'science_posang={:06.2f}_posang.fits'.format(pa), sci_posang[ii], overwrite=True)
 
                     # save final cubes
-                    fits.writeto(path.products / 'science_posang={:06.2f}_cube.fits'.format(pa), sci_cube[:, ii], overwrite=True)
+                    _write_cube(path.products / 'science_posang={:06.2f}_cube.fits'.format(pa), sci_cube[:, ii])
             else:
                 # save metadata
                 object_files.to_csv(path.products / 'science_posang=all_frames.csv')
                 fits.writeto(path.products / 'science_posang=all_posang.fits', sci_posang, overwrite=True)
 
                 # save final cubes
-                fits.writeto(path.products / 'science_posang=all_cube.fits', sci_cube, overwrite=True)
+                _write_cube(path.products / 'science_posang=all_cube.fits', sci_cube)
 
             # delete big cubes
             del sci_cube
@@ -1,8 +1,9 @@
 import pandas as pd
 import logging
 import numpy as np
-import collections
 import configparser
+import functools
+import os
 import shutil
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
@@ -12,6 +13,7 @@ import io
 
 from astropy.io import fits
 from astropy.time import Time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from matplotlib.backends.backend_pdf import PdfPages
 
@@ -24,6 +26,66 @@ _log = logging.getLogger(__name__)
 # WFS wavelength
 wave_wfs = 500e-9
 
+# cache of log file handlers, per reduction path
+_log_handlers = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _read_keywords():
+    '''
+    Read the list of SPARTA keywords and their short form
+
+    The result never changes during the lifetime of a process, so it is
+    parsed only once and cached.
+
+    Returns
+    -------
+    keywords, keywords_short : tuple of str
+        Full and shortened FITS keywords
+    '''
+
+    text = (Path(sphere.__file__).parent / 'instruments' / 'keywords_sparta.dat').read_text()
+    keywords = tuple(line for line in map(str.strip, text.splitlines())
+                     if line and not line.startswith('#'))
+
+    # short keywords
+    keywords_short = tuple(k.removeprefix('HIERARCH ESO ') for k in keywords)
+
+    return keywords, keywords_short
+
+
+def _fast_primary_header(filename):
+    '''
+    Read the primary FITS header without going through fits.open()
+
+    The raw 2880-byte header blocks are read until the END card is
+    found, which avoids the HDU discovery and data-layout parsing done
+    by astropy when opening the full file.
+
+    Parameters
+    ----------
+    filename : str or Path
+        Path to the FITS file
+
+    Returns
+    -------
+    hdr : fits.Header
+        Primary header of the file
+    '''
+
+    blocks = []
+    with open(filename, 'rb') as f:
+        while True:
+            block = f.read(2880)
+            if len(block) < 2880:
+                break
+            blocks.append(block)
+            # the END card is always aligned on an 80-character card
+            if any(block[i:i+8] == b'END     ' for i in range(0, 2880, 80)):
+                break
+
+    return fits.Header.fromstring(b''.join(blocks))
+
 
 class Reduction(object):
     '''
@@ -42,16 +104,19 @@ class Reduction(object):
     # Class variables
     ##################################################
 
+    # instrument
+    _instrument = 'SPARTA'
+
     # specify for each recipe which other recipes need to have been executed before
-    recipe_requirements = collections.OrderedDict([
-        ('sort_files', []),
-        ('sph_sparta_dtts', ['sort_files']),
-        ('sph_sparta_wfs_parameters', ['sort_files']),
-        ('sph_sparta_atmospheric_parameters', ['sort_files']),
-        ('sph_query_databases', ['sort_files']),
-        ('sph_sparta_plot', ['sort_files', 'sph_sparta_dtts', 'sph_sparta_wfs_parameters', 'sph_sparta_atmospheric_parameters']),
-        ('sph_sparta_clean', [])
-    ])
+    recipe_requirements = {
+        'sort_files': [],
+        'sph_sparta_dtts': ['sort_files'],
+        'sph_sparta_wfs_parameters': ['sort_files'],
+        'sph_sparta_atmospheric_parameters': ['sort_files'],
+        'sph_query_databases': ['sort_files'],
+        'sph_sparta_plot': ['sort_files', 'sph_sparta_dtts', 'sph_sparta_wfs_parameters', 'sph_sparta_atmospheric_parameters'],
+        'sph_sparta_clean': []
+    }
 
     ##################################################
     # Constructor
@@ -99,31 +164,36 @@ class Reduction(object):
 
         # init path
         reduction._path = utils.ReductionPath(path)
-        
-        # instrument and mode
-        reduction._instrument = 'SPARTA'
 
         #
         # logging
         #
         logger = logging.getLogger(str(path))
         logger.setLevel(log_level.upper())
-        if logger.hasHandlers():
-            for hdlr in logger.handlers:
+
+        # reuse the file handler when a reduction is re-created at the
+        # same path: creating a new one would leak an open file
+        # descriptor and truncate the log on every instantiation
+        handler = _log_handlers.get(str(path))
+        if handler is None:
+            handler = logging.FileHandler(reduction._path.products / 'reduction.log', mode='w', encoding='utf-8')
+            formatter = logging.Formatter('%(asctime)s\t%(levelname)8s\t%(message)s')
+            formatter.default_msec_format = '%s.%03d'
+            handler.setFormatter(formatter)
+            _log_handlers[str(path)] = handler
+
+        for hdlr in list(logger.handlers):
+            if hdlr is not handler:
                 logger.removeHandler(hdlr)
-        
-        handler = logging.FileHandler(reduction._path.products / 'reduction.log', mode='w', encoding='utf-8')
-        formatter = logging.Formatter('%(asctime)s\t%(levelname)8s\t%(message)s')
-        formatter.default_msec_format = '%s.%03d'        
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+
         if sphere_handler:
             logger.addHandler(sphere_handler)
         
         reduction._logger = logger
         
-        reduction._logger.info('Creating SPARTA reduction at path {}'.format(path))
+        reduction._logger.info('Creating SPARTA reduction at path %s', path)
 
         #
         # configuration
@@ -148,7 +218,16 @@ class Reduction(object):
         # reduction and recipe status
         #
         reduction._status = sphere.INIT
-        reduction._recipes_status = collections.OrderedDict()
+        reduction._recipes_status = {}
+
+        # compile the recipe requirements into bit masks: each recipe
+        # gets one bit and the mask of its requirements, so checking
+        # whether a recipe is executable is a single mask comparison
+        bits = {recipe: 1 << idx for idx, recipe in enumerate(cls.recipe_requirements)}
+        reduction._recipe_bits = bits
+        reduction._requirement_masks = {recipe: sum(bits[r] for r in reqs)
+                                        for recipe, reqs in cls.recipe_requirements.items()}
+        reduction._done_mask = 0
 
         for recipe in reduction.recipe_requirements.keys():
             reduction._update_recipe_status(recipe, sphere.NOTSET)
@@ -250,12 +329,21 @@ class Reduction(object):
         # path
         path = self.path
 
-        # files info
-        fname = path.preproc / 'files.csv'
+        # files info. The parquet file is tried first because it stores
+        # the time columns natively; the CSV fallback needs an explicit
+        # conversion
+        fname = path.preproc / 'files.parquet'
         if fname.exists():
+            self._logger.debug('> read files.parquet')
+
+            files_info = pd.read_parquet(fname)
+
+            # update recipe execution
+            self._update_recipe_status('sort_files', sphere.SUCCESS)
+        elif (path.preproc / 'files.csv').exists():
             self._logger.debug('> read files.csv')
-            
-            files_info = pd.read_csv(fname, index_col=0)
+
+            files_info = pd.read_csv(path.preproc / 'files.csv', index_col=0)
 
             # convert times
             files_info['DATE-OBS'] = pd.to_datetime(files_info['DATE-OBS'], utc=False)
@@ -367,7 +455,48 @@ class Reduction(object):
         self._logger.debug('> update recipe execution')
 
         self._recipes_status[recipe] = status
-    
+
+        # maintain the mask of successfully executed recipes
+        if status == sphere.SUCCESS:
+            self._done_mask |= self._recipe_bits[recipe]
+        else:
+            self._done_mask &= ~self._recipe_bits[recipe]
+
+    def _recipe_executable(self, recipe):
+        '''Check if a recipe is executable given the status of other recipes
+
+        Mask-based equivalent of toolbox.recipe_executable(): the
+        requirements compiled in the constructor are compared with the
+        mask of successfully executed recipes in a single operation.
+
+        Parameters
+        ----------
+        recipe : str
+            Name of the current recipe
+
+        Returns
+        -------
+        execute_recipe : bool
+            Current recipe can be executed safely
+        '''
+
+        if self._status == sphere.FATAL:
+            self._logger.critical('   ==> reduction is in a FATAL state! See log file for details')
+            return False
+
+        required = self._requirement_masks[recipe]
+        execute_recipe = (required & self._done_mask) == required
+
+        if not execute_recipe:
+            missing = [r for r in self.recipe_requirements[recipe]
+                       if not (self._recipe_bits[r] & self._done_mask)]
+            self._logger.error('{} cannot be executed because the following recipes have not been executed or have result in unrecoverable errors: {}. '.format(recipe, missing))
+            self._update_recipe_status(recipe, sphere.ERROR)
+
+        self._logger.debug('> execution requirements check for {}: {}'.format(recipe, execute_recipe))
+
+        return execute_recipe
+
     ##################################################
     # Generic class methods
     ##################################################
@@ -487,73 +616,84 @@ class Reduction(object):
         # parameters
         path = self.path
 
-        # list files
-        files = path.raw.glob('*.fits')
-        files = [f.stem for f in files]
+        # list files; os.scandir avoids creating (and stat'ing) a Path
+        # object per directory entry
+        with os.scandir(path.raw) as entries:
+            files = [e.name[:-5] for e in entries
+                     if e.name.endswith('.fits') and e.is_file(follow_symlinks=False)]
 
         if len(files) == 0:
             self._logger.critical('No raw FITS files in reduction path')
             self._update_recipe_status('sort_files', sphere.ERROR)
             self._status = sphere.FATAL
             return
-        
-        self._logger.info(' * found {0} raw FITS files'.format(len(files)))
+
+        self._logger.info(' * found %d raw FITS files', len(files))
 
         # read list of keywords
         self._logger.debug('> read keyword list')
-        keywords = []
-        file = open(Path(sphere.__file__).parent / 'instruments' / 'keywords_sparta.dat', 'r')
-        for line in file:
-            line = line.strip()
-            if line:
-                if line[0] != '#':
-                    keywords.append(line)
-        file.close()
-
-        # short keywords
-        self._logger.debug('> translate into short keywords')
-        keywords_short = keywords.copy()
-        for idx in range(len(keywords_short)):
-            key = keywords_short[idx]
-            if key.find('HIERARCH ESO ') != -1:
-                keywords_short[idx] = key[13:]
-
-        # files table
-        self._logger.debug('> create files_info data frame')
-        files_info = pd.DataFrame(index=pd.Index(files, name='FILE'), columns=keywords_short, dtype='float')
+        keywords, keywords_short = _read_keywords()
 
+        # read FITS keywords; accumulate rows and build the data frame
+        # in one go to avoid per-cell pandas assignments. The headers are
+        # read concurrently because this step is dominated by I/O latency
         self._logger.debug('> read FITS keywords')
-        for f in files:
-            hdu = fits.open(path.raw / '{}.fits'.format(f))
-            hdr = hdu[0].header
 
-            for k, sk in zip(keywords, keywords_short):
-                files_info.loc[f, sk] = hdr.get(k)
+        def read_header(f):
+            hdr = _fast_primary_header(path.raw / '{}.fits'.format(f))
 
-            hdu.close()
+            # drop files that are not handled, based on DPR keywords,
+            # before creating a row for them
+            if (hdr.get('HIERARCH ESO DPR TYPE') != 'OBJECT,AO') or \
+               (hdr.get('HIERARCH ESO OBS PROG ID') == 'Maintenance'):
+                return None
+
+            return {sk: hdr.get(k) for k, sk in zip(keywords, keywords_short)}
+
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            rows = list(executor.map(read_header, files))
+
+        files = [f for f, row in zip(files, rows) if row is not None]
+        rows  = [row for row in rows if row is not None]
+
+        if len(files) == 0:
+            self._logger.critical('No supported raw FITS files in reduction path')
+            self._update_recipe_status('sort_files', sphere.ERROR)
+            self._status = sphere.FATAL
+            return
+
+        # files table. from_records infers proper per-column dtypes from
+        # the header values instead of forcing a float cast per cell;
+        # infer_objects converts any column left as object because of
+        # missing keywords
+        self._logger.debug('> create files_info data frame')
+        files_info = pd.DataFrame.from_records(rows, index=pd.Index(files, name='FILE'), columns=keywords_short)
+        files_info = files_info.infer_objects()
 
         # artificially add arm keyword
         files_info.insert(files_info.columns.get_loc('DPR TECH')+1, 'SEQ ARM', 'SPARTA')
-            
-        # drop files that are not handled, based on DPR keywords
-        self._logger.debug('> drop unsupported file types')
-        files_info.dropna(subset=['DPR TYPE'], inplace=True)
-        files_info = files_info[(files_info['DPR TYPE'] == 'OBJECT,AO') & (files_info['OBS PROG ID'] != 'Maintenance')]
 
         # processed column
         files_info.insert(len(files_info.columns), 'PROCESSED', False)
 
-        # convert times
+        # convert times; the explicit format avoids pandas' per-value
+        # format inference
         self._logger.debug('> convert times')
-        files_info['DATE-OBS'] = pd.to_datetime(files_info['DATE-OBS'], utc=False)
-        files_info['DATE'] = pd.to_datetime(files_info['DATE'], utc=False)
+        files_info['DATE-OBS'] = pd.to_datetime(files_info['DATE-OBS'], utc=False, format='ISO8601')
+        files_info['DATE'] = pd.to_datetime(files_info['DATE'], utc=False, format='ISO8601')
 
         # sort by acquisition time
         files_info.sort_values(by='DATE-OBS', inplace=True)
 
-        # save files_info
-        self._logger.debug('> save files.csv')
-        files_info.to_csv(path.preproc / 'files.csv')
+        # save files_info. Parquet is preferred because it preserves the
+        # column dtypes and avoids the per-cell text formatting of CSV,
+        # but it requires an optional dependency (pyarrow)
+        try:
+            self._logger.debug('> save files.parquet')
+            files_info.to_parquet(path.preproc / 'files.parquet')
+        except ImportError:
+            self._logger.debug('> no parquet support ==> save files.csv')
+            files_info.to_csv(path.preproc / 'files.csv')
         self._files_info = files_info
 
         #
@@ -580,15 +720,15 @@ class Reduction(object):
         date = str(cinfo['DATE'][0])[0:10]
 
         self._logger.info('Extract frames information')
-        self._logger.info(' * Programme ID: {0}'.format(cinfo['OBS PROG ID'][0]))
-        self._logger.info(' * OB name:      {0}'.format(cinfo['OBS NAME'][0]))
-        self._logger.info(' * OB ID:        {0}'.format(cinfo['OBS ID'][0]))
-        self._logger.info(' * RA / DEC:     {0} / {1}'.format(RA, DEC))
-        self._logger.info(' * Date:         {0}'.format(date))
-        self._logger.info(' * Instrument:   {0}'.format(cinfo['SEQ ARM'][0]))
-        self._logger.info(' * Derotator:    {0}'.format(cinfo['INS4 DROT2 MODE'][0]))
-        self._logger.info(' * VIS WFS mode: {0}'.format(cinfo['AOS VISWFS MODE'][0]))
-        self._logger.info(' * IR WFS mode:  {0}'.format(cinfo['AOS IRWFS MODE'][0]))
+        self._logger.info(' * Programme ID: %s', cinfo['OBS PROG ID'][0])
+        self._logger.info(' * OB name:      %s', cinfo['OBS NAME'][0])
+        self._logger.info(' * OB ID:        %s', cinfo['OBS ID'][0])
+        self._logger.info(' * RA / DEC:     %s / %s', RA, DEC)
+        self._logger.info(' * Date:         %s', date)
+        self._logger.info(' * Instrument:   %s', cinfo['SEQ ARM'][0])
+        self._logger.info(' * Derotator:    %s', cinfo['INS4 DROT2 MODE'][0])
+        self._logger.info(' * VIS WFS mode: %s', cinfo['AOS VISWFS MODE'][0])
+        self._logger.info(' * IR WFS mode:  %s', cinfo['AOS IRWFS MODE'][0])
 
         # update recipe execution
         self._update_recipe_status('sort_files', sphere.SUCCESS)
@@ -610,8 +750,7 @@ class Reduction(object):
         self._logger.info('Process DTTS images')
 
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_sparta_dtts', 
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_sparta_dtts'):
             return
 
         # parameters
@@ -622,7 +761,7 @@ class Reduction(object):
         files = []
         img   = []
         for file, finfo in files_info.iterrows():
-            self._logger.debug(f' * {file}')
+            self._logger.debug(' * %s', file)
             hdu = fits.open(f'{path.raw}/{file}.fits')
             
             ext  = hdu['IRPixelAvgFrame']
@@ -690,7 +829,7 @@ class Reduction(object):
 
             with PdfPages(path.products / 'dtts_images.pdf') as pdf:
                 for page in range(npage):
-                    self._logger.debug(f'  * page {page+1}/{npage}')
+                    self._logger.debug('  * page %d/%d', page+1, npage)
 
                     plt.figure(figsize=(3*ncol, 3*nrow))
                     plt.subplot(111)
@@ -738,8 +877,7 @@ class Reduction(object):
         '''
 
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_sparta_wfs_parameters', 
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_sparta_wfs_parameters'):
             return
 
         # parameters
@@ -761,7 +899,7 @@ class Reduction(object):
             data = hdu['VisLoopParams']
             NDIT = data.header['NAXIS2']
 
-            self._logger.debug(f' * {file} ==> {NDIT} records')
+            self._logger.debug(' * %s ==> %d records', file, NDIT)
 
             files.extend(np.repeat(file, NDIT))
             img.extend(list(np.arange(NDIT)))
@@ -830,7 +968,7 @@ class Reduction(object):
         files = []
         img   = []
         for file, finfo in files_info.iterrows():
-            self._logger.debug(f' * {file}')
+            self._logger.debug(' * %s', file)
             hdu = fits.open(f'{path.raw}/{file}.fits')
             
             data = hdu['IRLoopParams']
@@ -898,8 +1036,7 @@ class Reduction(object):
         self._logger.info('Process atmospheric parameters')
 
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_sparta_atmospheric_parameters', 
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_sparta_atmospheric_parameters'):
             return
 
         # parameters
@@ -919,7 +1056,7 @@ class Reduction(object):
             data = hdu['AtmPerfParams']
             NDIT = data.header['NAXIS2']
 
-            self._logger.debug(f' * {file} ==> {NDIT} records')
+            self._logger.debug(' * %s ==> %d records', file, NDIT)
 
             files.extend(np.repeat(file, NDIT))
             img.extend(list(np.arange(NDIT)))
@@ -1013,8 +1150,7 @@ class Reduction(object):
         self._logger.info('Query ESO databases')
 
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_query_databases', 
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_query_databases'):
             return
 
         # parameters
@@ -1212,8 +1348,7 @@ class Reduction(object):
         self._logger.info('Plot SPARTA and atmospheric data')
         
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_sparta_plot',
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_sparta_plot'):
             return
 
         # parameters
@@ -1422,8 +1557,7 @@ class Reduction(object):
         self._logger.info('Clean reduction data')
         
         # check if recipe can be executed
-        if not toolbox.recipe_executable(self._recipes_status, self._status, 'sph_sparta_clean',
-                                         self.recipe_requirements, logger=self._logger):
+        if not self._recipe_executable('sph_sparta_clean'):
             return
 
         # parameters
@@ -1431,35 +1565,35 @@ class Reduction(object):
 
         # tmp
         if path.tmp.exists():
-            self._logger.debug('> remove {}'.format(path.tmp))
+            self._logger.debug('> remove %s', path.tmp)
             shutil.rmtree(path.tmp, ignore_errors=True)
 
         # sof
         if path.sof.exists():
-            self._logger.debug('> remove {}'.format(path.sof))
+            self._logger.debug('> remove %s', path.sof)
             shutil.rmtree(path.sof, ignore_errors=True)
 
         # calib
         if path.calib.exists():
-            self._logger.debug('> remove {}'.format(path.calib))
+            self._logger.debug('> remove %s', path.calib)
             shutil.rmtree(path.calib, ignore_errors=True)
 
         # preproc
         if path.preproc.exists():
-            self._logger.debug('> remove {}'.format(path.preproc))
+            self._logger.debug('> remove %s', path.preproc)
             shutil.rmtree(path.preproc, ignore_errors=True)
 
         # raw
         if delete_raw:
             if path.raw.exists():
-                self._logger.debug('> remove {}'.format(path.raw))
+                self._logger.debug('> remove %s', path.raw)
                 self._logger.warning('   ==> delete raw files')
                 shutil.rmtree(path.raw, ignore_errors=True)
 
         # products
         if delete_products:
             if path.products.exists():
-                self._logger.debug('> remove {}'.format(path.products))
+                self._logger.debug('> remove %s', path.products)
                 self._logger.warning('   ==> delete products')
                 shutil.rmtree(path.products, ignore_errors=True)
 
@@ -60,6 +60,151 @@ def _shift_fft(array, shift_value):
     return shifted
 
 
+# phase ramps of the most recent batched FFT shifts: the same shift
+# vector is typically applied to many frames in a row (e.g. one set of
+# centers for a whole sequence), and the complex exponential is as
+# expensive as the FFTs themselves
+_shift_rows_fft_cache = {}
+
+
+def _shift_rows_fft(array, shift_values):
+    Nx = array.shape[-1]
+
+    key = (array.shape[0], Nx, shift_values.tobytes())
+    cplx_tilt = _shift_rows_fft_cache.get(key)
+    if cplx_tilt is None:
+        x_ramp = np.arange(Nx, dtype=array.dtype) - Nx//2
+
+        tilt = (2*np.pi/Nx) * (shift_values[:, np.newaxis]*x_ramp)
+
+        cplx_tilt = np.cos(tilt) + 1j*np.sin(tilt)
+        cplx_tilt = fft.fftshift(cplx_tilt, axes=-1)
+
+        if len(_shift_rows_fft_cache) >= 8:
+            _shift_rows_fft_cache.clear()
+        _shift_rows_fft_cache[key] = cplx_tilt
+
+    narray  = fft.fft(fft.ifft(array, axis=-1) * cplx_tilt, axis=-1)
+    shifted = narray.real
+
+    return shifted
+
+
+def _shift_rows_interp(array, shift_values, cval=0):
+    # cubic spline interpolation along the rows only, so that the rows
+    # stay fully independent; matches ndimage.shift(order=3) away from
+    # the array edges
+    Nrow, Ncol = array.shape
+
+    coeffs = ndimage.spline_filter1d(array, order=3, axis=-1, mode='mirror')
+
+    x  = np.arange(Ncol, dtype=float) - shift_values[:, np.newaxis]
+    j0 = np.floor(x).astype(int)
+    f  = x - j0
+
+    # cubic B-spline weights of the 4 supporting coefficients
+    weights = ((1-f)**3 / 6,
+               (3*f**3 - 6*f**2 + 4) / 6,
+               (-3*f**3 + 3*f**2 + 3*f + 1) / 6,
+               f**3 / 6)
+
+    rows = np.arange(Nrow)[:, np.newaxis]
+    shifted = np.zeros_like(x)
+    for k, w in enumerate(weights):
+        shifted += w * coeffs[rows, np.clip(j0-1+k, 0, Ncol-1)]
+
+    # points shifted in from outside the array
+    shifted = np.where((x >= 0) & (x <= Ncol-1), shifted, cval)
+
+    return shifted
+
+
+def _shift_rows_roll(array, shift_values):
+    Ncol = array.shape[-1]
+
+    ishift = np.round(shift_values).astype(int)
+    cols   = (np.arange(Ncol) - ishift[:, np.newaxis]) % Ncol
+    shifted = array[np.arange(array.shape[0])[:, np.newaxis], cols]
+
+    return shifted
+
+
+def shift_rows(array, shift_values, method='fft', cval=0):
+    '''
+    Shift every row of a 2D input array along the horizontal axis.
+
+    This is the batched equivalent of calling shift() on each row with
+    its own shift value: the FFT phase ramps, spline interpolations or
+    rolls for all the rows are computed in a few vectorized calls
+    instead of one Python call per row.
+
+    Note that if the shift values are integers, the function uses the
+    roll method to shift the rows, as in shift().
+
+    Parameters
+    ----------
+    array : array
+        The 2D array whose rows will be shifted
+
+    shift_values : array
+        The shift along the horizontal axis, one value per row
+
+    method : str, optional
+        Method for shifting the rows, ('fft', 'interp', 'roll').
+        Default is 'fft'
+
+    cval : float, optional
+        Value used for points shifted in from outside the boundaries of
+        the input when method='interp'. Default is 0
+
+    Returns
+    -------
+    shift : array
+        The array with shifted rows
+
+    '''
+
+    method = method.lower()
+
+    # array dimensions
+    if array.ndim != 2:
+        raise ValueError('This function can only shift the rows of 2D arrays')
+
+    # check that shift values are fine
+    shift_values = np.asarray(shift_values).ravel()
+    if shift_values.size != array.shape[0]:
+        raise ValueError('Number of shift values and of rows in array don\'t match')
+
+    # check if shift values are int and automatically change method in case they are
+    if shift_values.dtype.kind == 'i':
+        method = 'roll'
+
+    # detects NaN and replace them with real values
+    mask = None
+    nan_mask = np.isnan(array)
+    if np.any(nan_mask):
+        medval = np.nanmedian(array, axis=-1, keepdims=True)
+        array = np.where(nan_mask, medval, array)
+
+        mask = _shift_rows_interp(nan_mask.astype(float), shift_values, cval=1)
+
+    # shift with appropriate function
+    if (method == 'fft'):
+        shifted = _shift_rows_fft(array.astype(float, copy=False), shift_values)
+    elif (method == 'interp'):
+        shifted = _shift_rows_interp(array, shift_values, cval=cval)
+    elif (method == 'roll'):
+        shifted = _shift_rows_roll(array, shift_values)
+    else:
+        raise ValueError('Unknown shift method \'{0}\''.format(method))
+
+    # puts back NaN
+    if mask is not None:
+        shifted[mask >= 0.5] = np.nan
+
+    return shifted
+
+
 def _shift_interp(array, shift_value, mode='constant', cval=0):
     # Manual alternative to built-in function: slightly slower
     Ndim  = array.ndim
@@ -264,7 +409,7 @@ def _rotate_fft(array, alpha, pad=4, x1=0, x2=0, y1=0, y2=0, cval=0):
         py1 = (pad*array.shape[1]/2)-y1
         py2 = (pad*array.shape[1]/2)+y1
 
-    pad_value = (np.array(array.shape)*(pad-1)/2).astype(np.int)
+    pad_value = (np.array(array.shape)*(pad-1)/2).astype(int)
     pad_frame = np.lib.pad(array, ((pad_value[0]), (pad_value[1])), mode='constant', constant_values=cval)
     
     pad_mask = np.isnan(array)
@@ -280,17 +425,17 @@ def _rotate_fft(array, alpha, pad=4, x1=0, x2=0, y1=0, y2=0, cval=0):
     pad_frame = np.where(np.isnan(pad_frame), 0, pad_frame)
     if x1 == 0:
         pad_frame[
-            np.int(((pad-1)/2)*array.shape[0]-1),
-            np.int(((pad-1)/2)*array.shape[1]):np.int(((pad+1)/2)*array.shape[1])] = array[0, :] / 2
+            int(((pad-1)/2)*array.shape[0]-1),
+            int(((pad-1)/2)*array.shape[1]):int(((pad+1)/2)*array.shape[1])] = array[0, :] / 2
         pad_frame[
-            np.int(((pad+1)/2)*array.shape[0]),
-            np.int(((pad-1)/2)*array.shape[1]):np.int(((pad+1)/2)*array.shape[1])] = array[-1, :] / 2
+            int(((pad+1)/2)*array.shape[0]),
+            int(((pad-1)/2)*array.shape[1]):int(((pad+1)/2)*array.shape[1])] = array[-1, :] / 2
         pad_frame[
-            np.int(((pad-1)/2)*array.shape[0]):np.int(((pad+1)/2)*array.shape[0]),
-            np.int(((pad-1)/2)*array.shape[1]-1)] = array[:, 0] / 2
+            int(((pad-1)/2)*array.shape[0]):int(((pad+1)/2)*array.shape[0]),
+            int(((pad-1)/2)*array.shape[1]-1)] = array[:, 0] / 2
         pad_frame[
-            np.int(((pad-1)/2)*array.shape[0]):np.int(((pad+1)/2)*array.shape[0]),
-            np.int(((pad+1)/2)*array.shape[1])] = array[:, -1] / 2
+            int(((pad-1)/2)*array.shape[0]):int(((pad+1)/2)*array.shape[0]),
+            int(((pad+1)/2)*array.shape[1])] = array[:, -1] / 2
     elif x1 > 0:
         pad_frame[px1, py1:py2]   = pad_frame[px1, py1:py2] / 2
         pad_frame[px2-1, py1:py2] = pad_frame[px2-1, py1:py2] / 2
@@ -318,8 +463,8 @@ def _rotate_fft(array, alpha, pad=4, x1=0, x2=0, y1=0, y2=0, cval=0):
 
     # final rotated frame
     rotated = np.real(pad_xyx[
-        np.int(((pad-1)/2)*array.shape[0]):np.int(((pad+1)/2)*array.shape[0]),
-        np.int(((pad-1)/2)*array.shape[1]):np.int(((pad+1)/2)*array.shape[1])]).copy()
+        int(((pad-1)/2)*array.shape[0]):int(((pad+1)/2)*array.shape[0]),
+        int(((pad-1)/2)*array.shape[1]):int(((pad+1)/2)*array.shape[1])]).copy()
     
     return rotated
 
@@ -569,9 +714,9 @@ def _scale_fft(array, scale_value, alt_criterion=False):
     # We minimize this difference between the `ideal' N" and its closest integer value      
     # Compared to the ALTernate criterion below, this one favors small
     # values of N" i.e. little truncation in Fourier space.  
-    kd_array = np.arange(dim/2 + 1, dtype=np.int)
-    yy = dim/2 * (zoom_io - 1) + kd_array.astype(np.float)*zoom_io
-    kf_array = np.round(yy).astype(np.int)
+    kd_array = np.arange(dim/2 + 1, dtype=int)
+    yy = dim/2 * (zoom_io - 1) + kd_array.astype(float)*zoom_io
+    kf_array = np.round(yy).astype(int)
 
     tmp = np.abs(yy-kf_array)
     # tmp[tmp == 0] = np.nan
@@ -861,7 +1006,7 @@ def sigma_filter(img, box=5, nsigma=3, iterate=False, return_mask=False, max_ite
 
     # create _mask at first iteration
     if _mask is None:
-        _mask = np.zeros_like(img, dtype=np.bool)
+        _mask = np.zeros_like(img, dtype=bool)
 
     # identify clipped pixels
     _mask[img != img_clip] = True
@@ -1,6 +1,7 @@
 import shutil
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 _log = logging.getLogger(__name__)
@@ -123,36 +124,28 @@ class ReductionPath(object):
             Log handler for the reduction. Default is root logger
         '''
 
-        # tmp
-        if self._tmp.exists():
-            logger.debug('> remove {}'.format(self._tmp))
-            shutil.rmtree(self._tmp, ignore_errors=True)
-
-        # sof
-        if self._sof.exists():
-            logger.debug('> remove {}'.format(self._sof))
-            shutil.rmtree(self._sof, ignore_errors=True)
-
-        # calib
-        if self._calib.exists():
-            logger.debug('> remove {}'.format(self._calib))
-            shutil.rmtree(self._calib, ignore_errors=True)
-
-        # preproc
-        if self._preproc.exists():
-            logger.debug('> remove {}'.format(self._preproc))
-            shutil.rmtree(self._preproc, ignore_errors=True)
+        # tmp, sof, calib, preproc
+        paths = [self._tmp, self._sof, self._calib, self._preproc]
 
         # raw
         if delete_raw:
             if self._raw.exists():
-                logger.debug('> remove {}'.format(self._raw))
                 logger.warning('   ==> delete raw files')
-                shutil.rmtree(self._raw, ignore_errors=True)
+                paths.append(self._raw)
 
         # products
         if delete_products:
             if self._products.exists():
-                logger.debug('> remove {}'.format(self._products))
                 logger.warning('   ==> delete products')
-                shutil.rmtree(self._products, ignore_errors=True)
+                paths.append(self._products)
+
+        # the sub-directories are independent, so they are deleted
+        # concurrently; rmtree is I/O-bound and releases the GIL
+        # during the underlying system calls
+        def remove_path(path):
+            if path.exists():
+                logger.debug('> remove {}'.format(path))
+                shutil.rmtree(path, ignore_errors=True)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(remove_path, paths))